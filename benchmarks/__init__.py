@@ -0,0 +1,6 @@
+"""Benchmarks for the multi-agent RAG pipeline.
+
+Run individual benchmarks from the repository root, e.g.:
+
+    python -m benchmarks.qa_concurrency --concurrency 16
+"""
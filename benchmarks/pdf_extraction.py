@@ -0,0 +1,47 @@
+"""PDF extraction throughput (pages/second) for each loader backend.
+
+Compares `PyPDFLoader` with PyMuPDF extraction, both in-process and with
+page ranges spread across a process pool.
+
+Usage (from the repository root):
+
+    python -m benchmarks.pdf_extraction path/to/paper.pdf --workers 4
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from src.app.core.retrieval.loaders import load_pdf_pymupdf, load_pdf_pypdf
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdf", type=Path)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    load_dotenv()
+    backends = {
+        "pypdf": lambda: load_pdf_pypdf(args.pdf),
+        "pymupdf": lambda: load_pdf_pymupdf(args.pdf, workers=1),
+        f"pymupdf x{args.workers}": lambda: load_pdf_pymupdf(
+            args.pdf, workers=args.workers, parallel_min_pages=0
+        ),
+    }
+
+    for name, load in backends.items():
+        best = float("inf")
+        pages = 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            pages = len(load())
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>12}: {pages} pages in {best:7.3f}s, {pages / best:8.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
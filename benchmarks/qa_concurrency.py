@@ -0,0 +1,73 @@
+"""Concurrent throughput of the QA flow: blocking vs. async execution.
+
+Before the async path existed, `/qa` ran `graph.invoke` directly inside the
+event loop, so a worker could only make progress on one question at a time.
+This benchmark reproduces that behaviour ("blocking" mode: the coroutine
+waits synchronously on the flow, stalling the loop) and compares it with the
+current `arun_qa_flow` path ("async" mode), firing the same batch of
+questions concurrently in both cases.
+
+Usage (from the repository root, with a configured `.env`):
+
+    python -m benchmarks.qa_concurrency --concurrency 16
+
+To measure pipeline overhead without network access, run it offline with
+`LLM_PROVIDER=fake VECTOR_STORE_BACKEND=local FAKE_LLM_LATENCY_MS=500`.
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List
+
+from dotenv import load_dotenv
+
+from src.app.core.agents.graph import arun_qa_flow, run_qa_flow
+
+QUESTIONS = [
+    "What is HNSW indexing?",
+    "What are the advantages of vector databases compared to traditional databases, and how do they handle scalability?",
+    "How do embeddings work in semantic search?",
+]
+
+_blocking_pool = ThreadPoolExecutor(max_workers=1)
+
+
+async def _blocking_call(question: str) -> dict:
+    # Waiting on the future without awaiting it blocks the event loop, which
+    # is exactly what the old synchronous `graph.invoke` call did.
+    return _blocking_pool.submit(run_qa_flow, question).result()
+
+
+async def _async_call(question: str) -> dict:
+    return await arun_qa_flow(question)
+
+
+async def _run_batch(
+    call: Callable[[str], Awaitable[dict]], questions: List[str]
+) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(call(q) for q in questions))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    load_dotenv()
+    questions = [QUESTIONS[i % len(QUESTIONS)] for i in range(args.concurrency)]
+
+    print(f"Concurrent questions: {len(questions)}")
+    for name, call in (("blocking", _blocking_call), ("async", _async_call)):
+        elapsed = asyncio.run(_run_batch(call, questions))
+        print(
+            f"{name:>8}: {elapsed:8.2f}s wall, "
+            f"{len(questions) / elapsed:6.2f} questions/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Cold-start benchmark: import time and time to first request.
+
+Every run starts a fresh interpreter that imports the API module and sends,
+through an in-process ASGI client:
+- `GET /health` (process can accept traffic)
+- optionally `POST /warmup` (explicit construction of models and graphs)
+- `POST /qa` (first answered question, including any lazy initialization)
+
+Usage (from the repository root):
+
+    LLM_PROVIDER=fake VECTOR_STORE_BACKEND=local \\
+        python -m benchmarks.startup --repeat 5 --output startup.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+def probe(warmup: bool, question: str) -> Dict[str, float]:
+    """Measure one cold start in the current (fresh) interpreter."""
+    start = time.perf_counter()
+    from src.app.api import app
+
+    timings = {"import_s": time.perf_counter() - start}
+
+    import httpx
+
+    async def requests() -> None:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup", timeout=None) as client:
+            (await client.get("/health")).raise_for_status()
+            timings["health_s"] = time.perf_counter() - start
+            if warmup:
+                (await client.post("/warmup")).raise_for_status()
+                timings["warmup_s"] = time.perf_counter() - start
+            (await client.post("/qa", json={"question": question})).raise_for_status()
+            timings["first_qa_s"] = time.perf_counter() - start
+
+    asyncio.run(requests())
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", action="store_true", help="call /warmup before the first question")
+    parser.add_argument("--question", default="What is HNSW indexing?")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(probe(args.warmup, args.question)))
+        return
+
+    command = [sys.executable, "-m", "benchmarks.startup", "--probe", "--question", args.question]
+    if args.warmup:
+        command.append("--warmup")
+
+    runs: List[Dict[str, float]] = []
+    for _ in range(args.repeat):
+        completed = subprocess.run(command, capture_output=True, text=True, check=True)
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    report = {
+        f"{metric[:-2]}_ms": round(1000 * statistics.median(run[metric] for run in runs), 2)
+        for metric in runs[0]
+    }
+    for metric, value in report.items():
+        print(f"{metric:>14}: {value:9.2f} (median of {len(runs)})")
+
+    if args.output:
+        args.output.write_text(json.dumps({"median_ms": report, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
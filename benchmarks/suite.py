@@ -0,0 +1,274 @@
+"""End-to-end benchmark suite for the QA pipeline and indexing.
+
+Drives the pipeline in-process (no server needed) and reports:
+- per-node and end-to-end latency percentiles (p50/p95/p99) for
+  `arun_qa_flow` at a configurable concurrency, for each pipeline profile
+  ("full" and "fast") plus the fast-vs-full latency delta
+- the same for the FastAPI `/qa` endpoint via an in-process ASGI client
+- indexing throughput (pages/s, chunks/s) for an optional PDF
+- throughput and the process memory high-water mark
+
+Results are written as JSON so runs can be diffed between commits:
+
+    python -m benchmarks.suite --requests 30 --concurrency 8 --output bench.json
+    python -m benchmarks.suite --output new.json --compare bench.json
+
+Run offline with `LLM_PROVIDER=fake VECTOR_STORE_BACKEND=local` to measure
+the pipeline's own overhead without provider latency noise.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import httpx
+from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.app.core.config import get_settings
+
+QUESTIONS = [
+    "What is HNSW indexing?",
+    "What are the advantages of vector databases compared to traditional databases, and how do they handle scalability?",
+    "How do embeddings work in semantic search?",
+]
+
+NODES = ("routing", "planning", "retrieval", "summarization", "grounding", "verification", "answer")
+MODES = ("full", "fast")
+
+
+class NodeTimer(BaseCallbackHandler):
+    """Records wall-clock duration of every LangGraph node run."""
+
+    def __init__(self) -> None:
+        self.starts: Dict[UUID, tuple[str, float]] = {}
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if node in NODES and kwargs.get("name") == node:
+            self.starts[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self.starts.pop(run_id, None)
+        if started is not None:
+            node, start = started
+            self.durations[node].append(time.perf_counter() - start)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean_ms": round(1000 * sum(values) / len(values), 2) if values else 0.0,
+        "p50_ms": round(1000 * percentile(values, 50), 2),
+        "p95_ms": round(1000 * percentile(values, 95), 2),
+        "p99_ms": round(1000 * percentile(values, 99), 2),
+    }
+
+
+async def _run_concurrently(call, total: int, concurrency: int) -> tuple[List[float], float, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(index: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(QUESTIONS[index % len(QUESTIONS)])
+            except Exception as exc:
+                errors += 1
+                print(f"  request {index} failed: {type(exc).__name__}: {exc}", file=sys.stderr)
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return latencies, time.perf_counter() - start, errors
+
+
+async def bench_flow(total: int, concurrency: int, mode: str) -> Dict[str, Any]:
+    from src.app.core.agents.graph import arun_qa_flow
+
+    timer = NodeTimer()
+    latencies, wall, errors = await _run_concurrently(
+        lambda q: arun_qa_flow(q, callbacks=[timer], mode=mode), total, concurrency
+    )
+    return {
+        "end_to_end": summarize(latencies),
+        "nodes": {node: summarize(values) for node, values in timer.durations.items()},
+        "throughput_rps": round(len(latencies) / wall, 3) if wall else 0.0,
+        "wall_s": round(wall, 3),
+        "errors": errors,
+    }
+
+
+async def bench_api(total: int, concurrency: int, mode: str) -> Dict[str, Any]:
+    from src.app.api import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def call(question: str) -> None:
+            response = await client.post("/qa", json={"question": question, "mode": mode})
+            response.raise_for_status()
+
+        latencies, wall, errors = await _run_concurrently(call, total, concurrency)
+    return {
+        "end_to_end": summarize(latencies),
+        "throughput_rps": round(len(latencies) / wall, 3) if wall else 0.0,
+        "wall_s": round(wall, 3),
+        "errors": errors,
+    }
+
+
+def bench_indexing(pdf: Path) -> Dict[str, Any]:
+    from src.app.services.indexing_service import index_pdf_file
+
+    start = time.perf_counter()
+    result = index_pdf_file(pdf)
+    elapsed = time.perf_counter() - start
+    return {
+        **result,
+        "elapsed_s": round(elapsed, 3),
+        "pages_per_s": round(result["pages_parsed"] / elapsed, 2),
+        "chunks_per_s": round(result["chunks_indexed"] / elapsed, 2),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is reported in KiB on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _flatten(data: Any, prefix: str = "") -> Dict[str, float]:
+    if isinstance(data, dict):
+        flat: Dict[str, float] = {}
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        return flat
+    if isinstance(data, (int, float)) and not isinstance(data, bool):
+        return {prefix.rstrip("."): float(data)}
+    return {}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print metrics that differ from a baseline results file."""
+    old = _flatten(baseline["results"])
+    print(f"\nComparison against {baseline['meta']['commit']}:")
+    for key, value in _flatten(current["results"]).items():
+        if key in old and old[key] != value:
+            change = (value - old[key]) / old[key] * 100 if old[key] else float("inf")
+            print(f"  {key:<45} {old[key]:>12.2f} -> {value:>12.2f} ({change:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pdf", type=Path, help="PDF to index for the indexing benchmark")
+    parser.add_argument("--skip-api", action="store_true")
+    parser.add_argument(
+        "--modes",
+        type=lambda value: value.split(","),
+        default=list(MODES),
+        help="comma-separated pipeline profiles to benchmark (default: full,fast)",
+    )
+    parser.add_argument(
+        "--use-answer-cache",
+        action="store_true",
+        help="keep the answer cache enabled (disabled by default so every request runs the graph)",
+    )
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to diff against")
+    args = parser.parse_args()
+
+    load_dotenv()
+    settings = get_settings()
+    settings.answer_cache_enabled = args.use_answer_cache
+
+    results: Dict[str, Any] = {}
+    if args.pdf:
+        print(f"Indexing {args.pdf} ...")
+        results["indexing"] = bench_indexing(args.pdf)
+    for mode in args.modes:
+        print(f"QA flow [{mode}]: {args.requests} requests, concurrency {args.concurrency} ...")
+        results.setdefault("qa_flow", {})[mode] = asyncio.run(
+            bench_flow(args.requests, args.concurrency, mode)
+        )
+        if not args.skip_api:
+            print(f"API /qa [{mode}]: {args.requests} requests, concurrency {args.concurrency} ...")
+            results.setdefault("api", {})[mode] = asyncio.run(
+                bench_api(args.requests, args.concurrency, mode)
+            )
+    if {"full", "fast"} <= set(args.modes):
+        full = results["qa_flow"]["full"]["end_to_end"]
+        fast = results["qa_flow"]["fast"]["end_to_end"]
+        results["fast_vs_full_delta_ms"] = {
+            key: round(fast[key] - full[key], 2) for key in ("p50_ms", "p95_ms", "p99_ms")
+        }
+    results["memory"] = {"max_rss_mb": _max_rss_mb()}
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "llm_provider": settings.llm_provider,
+            "vector_store_backend": settings.vector_store_backend,
+            "retrieval_mode": settings.retrieval_mode,
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(results, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
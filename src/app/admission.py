@@ -0,0 +1,139 @@
+"""Admission control for the API: bounded concurrency and load shedding.
+
+Each guarded endpoint has an `AdmissionController`: at most
+`admission_<endpoint>_concurrency` requests run at once, up to
+`admission_<endpoint>_queue` more wait (for at most
+`admission_queue_timeout_seconds`), and anything beyond that is rejected
+immediately with `AdmissionRejected`, which the API turns into
+503 + Retry-After. Shedding early keeps a burst from fanning out into
+hundreds of concurrent LLM calls that would all slow down together.
+"""
+
+import asyncio
+import math
+import time
+from functools import lru_cache
+
+from .core.config import get_settings
+from .core.metrics import REGISTRY
+
+ADMISSION_WAIT = REGISTRY.histogram(
+    "ikms_admission_wait_seconds",
+    "Time admitted requests waited in the admission queue.",
+    labels=("endpoint",),
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "ikms_admission_rejected_total",
+    "Requests shed by admission control, by endpoint and reason.",
+    labels=("endpoint", "reason"),
+)
+
+# Smoothing factor of the moving average of request service time.
+_EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a request is shed; carries a Retry-After hint in seconds."""
+
+    def __init__(self, endpoint: str, reason: str, retry_after: int) -> None:
+        super().__init__(f"{endpoint} is overloaded ({reason}); retry in {retry_after}s.")
+        self.endpoint = endpoint
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionSlot:
+    """An admitted request; `release` is idempotent."""
+
+    def __init__(self, controller: "AdmissionController") -> None:
+        self._controller = controller
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(time.monotonic() - self._started)
+
+
+class AdmissionController:
+    """Concurrency limit plus bounded wait queue for one endpoint."""
+
+    def __init__(
+        self, endpoint: str, max_concurrent: int, max_queue: int, queue_timeout: float
+    ) -> None:
+        self.endpoint = endpoint
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._service_seconds = 1.0
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the average service time."""
+        backlog = (self.waiting + 1) / self.max_concurrent
+        return max(1, math.ceil(self._service_seconds * backlog))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        ADMISSION_REJECTED.inc(endpoint=self.endpoint, reason=reason)
+        return AdmissionRejected(self.endpoint, reason, self.retry_after())
+
+    async def acquire(self) -> AdmissionSlot:
+        """Wait for a slot or raise `AdmissionRejected` when overloaded."""
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            raise self._reject("queue_full")
+
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except TimeoutError:
+            raise self._reject("queue_timeout") from None
+        finally:
+            self.waiting -= 1
+
+        ADMISSION_WAIT.observe(time.monotonic() - start, endpoint=self.endpoint)
+        self.in_flight += 1
+        return AdmissionSlot(self)
+
+    def _release(self, service_seconds: float) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+        self._service_seconds += _EWMA_ALPHA * (service_seconds - self._service_seconds)
+
+
+ENDPOINTS = ("qa", "qa_stream", "qa_batch", "index_pdf")
+
+
+@lru_cache(maxsize=None)
+def get_admission_controller(endpoint: str) -> AdmissionController:
+    """Get the controller for one of `ENDPOINTS`, sized from settings."""
+    settings = get_settings()
+    return AdmissionController(
+        endpoint,
+        max_concurrent=getattr(settings, f"admission_{endpoint}_concurrency"),
+        max_queue=getattr(settings, f"admission_{endpoint}_queue"),
+        queue_timeout=settings.admission_queue_timeout_seconds,
+    )
+
+
+REGISTRY.register_collector(
+    "ikms_admission_in_flight",
+    "Admitted requests currently running, per endpoint.",
+    "gauge",
+    lambda: [
+        ("ikms_admission_in_flight", {"endpoint": e}, get_admission_controller(e).in_flight)
+        for e in ENDPOINTS
+    ],
+)
+REGISTRY.register_collector(
+    "ikms_admission_queue_depth",
+    "Requests waiting for an admission slot, per endpoint.",
+    "gauge",
+    lambda: [
+        ("ikms_admission_queue_depth", {"endpoint": e}, get_admission_controller(e).waiting)
+        for e in ENDPOINTS
+    ],
+)
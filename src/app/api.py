@@ -1,13 +1,39 @@
+import json
+import logging
 from pathlib import Path
+from typing import AsyncIterator
 
-from fastapi import FastAPI, File, HTTPException, Request, UploadFile, status
+from fastapi import FastAPI, File, HTTPException, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from .models import QuestionRequest, QAResponse
-from .services.qa_service import answer_question
-from .services.indexing_service import index_pdf_file
+from .admission import AdmissionRejected, get_admission_controller
+from .core.config import get_settings
+from .core.metrics import REGISTRY
+from .models import (
+    BatchQAItem,
+    BatchQAResponse,
+    BatchQuestionRequest,
+    QuestionRequest,
+    QAResponse,
+)
+from .services.qa_service import (
+    aanswer_question,
+    aanswer_questions,
+    answer_cache_stats,
+    astream_answer,
+)
+from .services.indexing_jobs import JobQueueFullError, get_indexing_job_manager
+from .services.upload_service import UploadTooLargeError, save_upload
+from .services.warmup_service import warm_up
 
+logging.basicConfig(
+    level=get_settings().log_level.upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
 
 app = FastAPI(
     title="Class 12 Multi-Agent RAG Demo",
@@ -27,6 +53,109 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class UploadSizeLimitMiddleware:
+    """Reject `/index-pdf` bodies larger than `upload_max_bytes` with 413.
+
+    A declared Content-Length over the limit is rejected before anything is
+    read. Chunked requests are counted as their body arrives and aborted as
+    soon as the limit is crossed, before the multipart parser has spooled
+    the rest. `save_upload` then enforces the limit on the file part itself.
+
+    Registered innermost, so the 413 raised from `receive` reaches the route
+    directly rather than through another middleware's receive wrapper.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] != "/index-pdf":
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = get_settings().upload_max_bytes
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            response = JSONResponse(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                content={"detail": "Upload exceeds the maximum size."},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # Raised while the form is being parsed; FastAPI passes
+                    # HTTPExceptions from body parsing through unchanged.
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Upload exceeds the maximum size.",
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(UploadSizeLimitMiddleware)
+
+
+# Endpoints guarded by admission control (see `admission.py`)
+ADMISSION_ROUTES = {
+    ("POST", "/qa"): "qa",
+    ("POST", "/qa/stream"): "qa_stream",
+    ("POST", "/qa/batch"): "qa_batch",
+    ("POST", "/index-pdf"): "index_pdf",
+}
+
+
+class AdmissionControlMiddleware:
+    """Bound concurrent requests per endpoint and shed load with 503.
+
+    Runs before the request body is read, so rejected uploads and questions
+    cost almost nothing. The slot is held until the wrapped app returns,
+    which covers the whole lifetime of `/qa/stream` responses, and is
+    released in `finally` so a failed send or client disconnect cannot leak
+    it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        endpoint = None
+        if scope["type"] == "http":
+            endpoint = ADMISSION_ROUTES.get((scope["method"], scope["path"]))
+        if endpoint is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            slot = await get_admission_controller(endpoint).acquire()
+        except AdmissionRejected as exc:
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": str(exc)},
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            slot.release()
+
+
+app.add_middleware(AdmissionControlMiddleware)
+
+
 @app.get("/")
 def root():
     return {
@@ -38,6 +167,41 @@ def root():
 def health():
     return {"status": "healthy"}
 
+
+@app.post("/warmup")
+async def warmup() -> dict:
+    """Build models, agents, vector store and graphs ahead of the first question.
+
+    Everything is otherwise constructed lazily on first use, so `/health`
+    answers as soon as the process starts. Call this from a readiness hook
+    to move that one-off cost out of the first user request.
+    """
+    timings = await run_in_threadpool(warm_up)
+    return {"status": "warm", "timings_ms": timings}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Expose pipeline metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        REGISTRY.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+def _to_response(result: dict) -> QAResponse:
+    """Map a QA flow result onto the public response model."""
+    return QAResponse(
+        answer=result.get("answer") or "",
+        context=result.get("context") or "",
+        plan=result.get("plan"),
+        sub_questions=result.get("sub_questions"),
+        complexity=result.get("complexity"),
+        route=result.get("route"),
+        compression_ratio=result.get("compression_ratio"),
+        degradations=result.get("degradations") or [],
+    )
+
+
 @app.post("/qa", response_model=QAResponse, status_code=status.HTTP_200_OK)
 async def qa_endpoint(payload: QuestionRequest) -> QAResponse:
     """Submit a question about the vector databases paper.
@@ -58,26 +222,112 @@ async def qa_endpoint(payload: QuestionRequest) -> QAResponse:
             detail="`question` must be a non-empty string.",
         )
 
-    # Delegate to the service layer which runs the multi-agent QA graph
-    result = answer_question(question)
+    # Delegate to the service layer which runs the multi-agent QA graph.
+    # Awaiting the async flow keeps the event loop free for other requests.
+    result = await aanswer_question(
+        question, mode=payload.mode, latency_budget=payload.latency_budget_seconds
+    )
 
-    return QAResponse(
-        answer=result.get("answer", ""),
-        context=result.get("context", ""),
-        plan=result.get("plan"),
-        sub_questions=result.get("sub_questions")
+    return _to_response(result)
+
+
+@app.post("/qa/batch", response_model=BatchQAResponse, status_code=status.HTTP_200_OK)
+async def qa_batch_endpoint(payload: BatchQuestionRequest) -> BatchQAResponse:
+    """Answer a list of questions in one request.
+
+    Identical questions are answered once, cache lookups share one
+    embedding request, and the remaining questions run through the QA graph
+    with bounded concurrency (`QA_BATCH_MAX_CONCURRENCY`). Returns 400 for
+    an empty batch, an empty question or more than `QA_BATCH_MAX_QUESTIONS`
+    questions; per-question failures are reported in `results`.
+    """
+    questions = [question.strip() for question in payload.questions]
+    max_questions = get_settings().qa_batch_max_questions
+    if not questions or len(questions) > max_questions:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"`questions` must contain between 1 and {max_questions} questions.",
+        )
+    if not all(questions):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Every question must be a non-empty string.",
+        )
+
+    batch = await aanswer_questions(questions, mode=payload.mode)
+    return BatchQAResponse(
+        results=[
+            BatchQAItem(
+                question=item["question"],
+                answer=_to_response(item["result"]) if item["result"] is not None else None,
+                error=item["error"],
+                cached=item["cached"],
+            )
+            for item in batch["results"]
+        ],
+        questions=batch["questions"],
+        unique_questions=batch["unique_questions"],
+        cache_hits=batch["cache_hits"],
+        failed=batch["failed"],
+        total_seconds=batch["total_seconds"],
     )
 
 
-@app.post("/index-pdf", status_code=status.HTTP_200_OK)
+@app.post("/qa/stream")
+async def qa_stream_endpoint(payload: QuestionRequest) -> StreamingResponse:
+    """Answer a question as a server-sent-events stream.
+
+    Emits, in order:
+    - `plan`: plan and sub-questions as soon as planning completes
+    - `context`: retrieved context once retrieval completes
+    - `token`: the final answer, token by token, as it is generated
+    - `replace`: a fallback answer that replaces the tokens sent so far,
+      when the answering stage timed out mid-stream
+    - `answer`: the complete response (same fields as `/qa`)
+    """
+    question = payload.question.strip()
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`question` must be a non-empty string.",
+        )
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for event, data in astream_answer(
+            question, mode=payload.mode, latency_budget=payload.latency_budget_seconds
+        ):
+            if event == "answer":
+                data = _to_response(data).model_dump()
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/qa/cache-stats")
+def qa_cache_stats() -> dict:
+    """Return hit/miss counters for the QA answer cache."""
+    return answer_cache_stats()
+
+
+@app.post("/index-pdf", status_code=status.HTTP_202_ACCEPTED)
 async def index_pdf(file: UploadFile = File(...)) -> dict:
-    """Upload a PDF and index it into the vector database.
+    """Upload a PDF and queue it for indexing into the vector database.
 
     This endpoint:
     - Accepts a PDF file upload
-    - Saves it to the local `data/uploads/` directory
-    - Uses PyPDFLoader to load the document into LangChain `Document` objects
-    - Indexes those documents into the configured Pinecone vector store
+    - Rejects request bodies over `upload_max_bytes` (413) while they are
+      being received (see `UploadSizeLimitMiddleware`)
+    - Copies the upload to `Settings.upload_dir` in fixed-size chunks,
+      hashing the content on the fly
+    - Skips re-indexing when identical content was uploaded before
+    - Submits a background job that loads the document with PyPDFLoader and
+      indexes it into the configured Pinecone vector store
+    - Returns immediately with a job id; poll `/index-jobs/{job_id}` for progress
+    - Returns 503 with Retry-After when too many jobs are already queued
     """
 
     if file.content_type not in ("application/pdf",):
@@ -86,18 +336,52 @@ async def index_pdf(file: UploadFile = File(...)) -> dict:
             detail="Only PDF files are supported.",
         )
 
-    upload_dir = Path("data/uploads")
-    upload_dir.mkdir(parents=True, exist_ok=True)
-
-    file_path = upload_dir / file.filename
-    contents = await file.read()
-    file_path.write_bytes(contents)
+    settings = get_settings()
+    try:
+        stored = await save_upload(
+            file,
+            upload_dir=Path(settings.upload_dir),
+            max_bytes=settings.upload_max_bytes,
+            chunk_size=settings.upload_chunk_size,
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(exc),
+        ) from exc
 
-    # Index the saved PDF
-    chunks_indexed = index_pdf_file(file_path)
+    try:
+        job, created = get_indexing_job_manager().submit(
+            stored.path, file.filename, content_hash=stored.content_hash
+        )
+    except JobQueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
 
     return {
         "filename": file.filename,
-        "chunks_indexed": chunks_indexed,
-        "message": "PDF indexed successfully.",
+        "content_hash": stored.content_hash,
+        "job_id": job.job_id,
+        "status_url": f"/index-jobs/{job.job_id}",
+        "duplicate": not created,
+        "message": (
+            "PDF queued for indexing."
+            if created
+            else "Identical PDF was already uploaded; reusing its indexing job."
+        ),
     }
+
+
+@app.get("/index-jobs/{job_id}")
+def index_job_status(job_id: str) -> dict:
+    """Report the stage, progress and throughput of an indexing job."""
+    job = get_indexing_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown indexing job `{job_id}`.",
+        )
+    return job.to_dict()
@@ -1,25 +1,41 @@
 """Agent implementations for the multi-agent RAG flow.
 
-This module defines three LangChain agents (Retrieval, Summarization,
-Verification) and thin node functions that LangGraph uses to invoke them.
+This module defines four LangChain agents (Planning, Retrieval, Summarization,
+Verification) and thin async node functions that LangGraph uses to invoke
+them. The nodes await `agent.ainvoke` so that a running graph never blocks
+the event loop of the API worker while waiting on the LLM provider.
+
+Agents (and their chat models) are built on first use by `get_agent`, so
+importing this module does not construct any provider client.
 """
 
-from typing import List
+import logging
+from functools import lru_cache
+from typing import Any, List, Sequence, Tuple
 
-from langchain.agents import create_agent
+from langchain_core.documents import Document
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
-from langchain_openai import ChatOpenAI
-from .state import QAState
 from ..llm.factory import create_chat_model
 
 from .prompts import (
     RETRIEVAL_SYSTEM_PROMPT,
     SUMMARIZATION_SYSTEM_PROMPT,
     VERIFICATION_SYSTEM_PROMPT,
-    PLANNING_SYSTEM_PROMPT
+    PLANNING_SYSTEM_PROMPT,
+    GROUNDED_ANSWER_SYSTEM_PROMPT,
 )
+from .deadline import RETRIEVAL_TIMEOUT_ANSWER, hedged
+from .planning import PlanningOutput, get_plan_cache
 from .state import QAState
 from .tools import retrieval_tool
+from ..config import get_settings
+from ..retrieval.compression import compress_documents
+from ..retrieval.context import assemble_context
+from ..retrieval.serialization import serialize_chunks
+from ..retrieval.vector_store import aretrieve_many
+from ..metrics import CONTEXT_CHARS, CONTEXT_COMPRESSION, RETRIEVED_CHUNKS
+
+logger = logging.getLogger(__name__)
 
 def _extract_last_ai_content(messages: List[object]) -> str:
     """Extract the content of the last AIMessage in a messages list."""
@@ -28,78 +44,107 @@ def _extract_last_ai_content(messages: List[object]) -> str:
             return str(msg.content)
     return ""
 
-# Define agents at module level for reuse
-retrieval_agent = create_agent(
-    model=create_chat_model(),
-    tools=[retrieval_tool],
-    system_prompt=RETRIEVAL_SYSTEM_PROMPT,
-)
+def _build_context(
+    results: Sequence[Sequence[Document]], queries: Sequence[str]
+) -> Tuple[List[Document], float]:
+    """Compress (when enabled), merge and budget retrieval results.
 
-summarization_agent = create_agent(
-    model=create_chat_model(),
-    tools=[],
-    system_prompt=SUMMARIZATION_SYSTEM_PROMPT,
-)
-
-verification_agent = create_agent(
-    model=create_chat_model(),
-    tools=[],
-    system_prompt=VERIFICATION_SYSTEM_PROMPT,
-)
-			
-planning_agent = create_agent(
-    model=create_chat_model(),
-    tools=[],
-    system_prompt=PLANNING_SYSTEM_PROMPT,
-)
+    Returns the selected documents and the compression ratio of this request.
+    """
+    ratio = 1.0
+    if get_settings().context_compression_enabled:
+        results, stats = compress_documents(results, queries)
+        ratio = stats.ratio
+        CONTEXT_COMPRESSION.observe(ratio)
+    return assemble_context(results), ratio
+
+# System prompt, tools and structured response schema of every agent, keyed
+# by role
+AGENT_SPECS = {
+    "planning": (PLANNING_SYSTEM_PROMPT, [], PlanningOutput),
+    "retrieval": (RETRIEVAL_SYSTEM_PROMPT, [retrieval_tool], None),
+    "summarization": (SUMMARIZATION_SYSTEM_PROMPT, [], None),
+    "verification": (VERIFICATION_SYSTEM_PROMPT, [], None),
+    "grounded_answer": (GROUNDED_ANSWER_SYSTEM_PROMPT, [], None),
+}
+
+
+@lru_cache(maxsize=None)
+def get_agent(role: str) -> Any:
+    """Get the agent for `role` (see `AGENT_SPECS`), creating it on first use."""
+    from langchain.agents import create_agent
+
+    system_prompt, tools, response_format = AGENT_SPECS[role]
+    return create_agent(
+        model=create_chat_model(),
+        tools=tools,
+        system_prompt=system_prompt,
+        response_format=response_format,
+    )
 
-def planning_agent_node(state: dict) -> dict:
+async def planning_agent_node(state: dict) -> dict:
     """
     Executes the query planning agent.
     
     This node:
     1. Takes the user's question
-    2. Analyzes it for complexity
-    3. Generates a search strategy
-    4. Decomposes into sub-questions
+    2. Returns the cached plan of an identical or near-identical question
+    3. Otherwise asks the planning agent for a structured `PlanningOutput`
+       (search strategy, complexity and sub-questions)
     
     Args:
         state: Current QAState with 'question'
         
     Returns:
-        dict with 'plan' and 'sub_questions'    
+        dict with 'plan', 'complexity' and 'sub_questions'
     """
     # Get the user's question
     question = state["question"]
 
-    # Create message for the planning agent
-    user_content = f"Question: {question}"	 
-    
-    # Invoke the planning agent
-    result = planning_agent.invoke(
-        {"messages": [HumanMessage(content=user_content)]}
+    cache = get_plan_cache() if get_settings().plan_cache_enabled else None
+    output = cache.get(question) if cache is not None else None
+
+    if output is None:
+        # Create message for the planning agent
+        user_content = f"Question: {question}"
+
+        # Invoke the planning agent
+        # Short call: hedged with a second request when it runs past its p95
+        result = await hedged(
+            "planning",
+            state,
+            lambda: get_agent("planning").ainvoke(
+                {"messages": [HumanMessage(content=user_content)]}
+            ),
+        )
+        output = result.get("structured_response")
+
+        if isinstance(output, PlanningOutput):
+            if cache is not None:
+                cache.put(question, output)
+        else:
+            # The model ignored the schema: fall back to parsing its text,
+            # never retrieving with the whole response as a sub-question.
+            plan_response = _extract_last_ai_content(result.get("messages", []))
+            plan, sub_questions = parse_planning_response(plan_response)
+            if sub_questions == [plan_response]:
+                sub_questions = [question]
+            output = PlanningOutput(plan=plan, complexity="moderate", sub_questions=sub_questions)
+
+    sub_questions = output.cleaned_sub_questions()
+    logger.debug(
+        "Planning output for %r: plan=%r complexity=%s sub_questions=%r",
+        question,
+        output.plan,
+        output.complexity,
+        sub_questions,
     )
-
-    # Extract response
-    messages = result.get("messages", [])
-    plan_response = _extract_last_ai_content(messages)
-    
-    # Parse the response to extract plan and sub-questions
-    plan, sub_questions = parse_planning_response(plan_response)
-    
-    # Print for debugging
-    print("\n" + "="*60)
-    print("🧠 PLANNING AGENT OUTPUT")
-    print("="*60)
-    print(f"Original Question: {question}")
-    print(f"\nPlan:\n{plan}")
-    print(f"\nSub-questions ({len(sub_questions)}): {sub_questions}")
-    print("="*60 + "\n")
     
     # Return updated state
     return {
-        "plan": plan,
-        "sub_questions": sub_questions
+        "plan": output.plan,
+        "complexity": output.complexity,
+        "sub_questions": sub_questions,
     }
 
 
@@ -159,7 +204,7 @@ def parse_planning_response(response: str) -> tuple[str, list[str]]:
     return plan.strip(), sub_questions
 
 
-def retrieval_node(state: QAState) -> dict:
+async def retrieval_node(state: QAState) -> dict:
     """
     Enhanced Retrieval Agent node: gathers context from vector store using planning.
 
@@ -170,7 +215,8 @@ def retrieval_node(state: QAState) -> dict:
       * Search strategy from planning
       * Decomposed sub-questions
     - The agent uses the retrieval tool to fetch document chunks
-    - Extracts the tool's content (CONTEXT string) from ToolMessage
+    - Collects the documents of every retrieval tool call (ToolMessage
+      artifacts), merges, deduplicates and token-budgets them
     - Stores the consolidated context string in state["context"]
     
     The planning information helps the agent make more targeted,
@@ -181,14 +227,12 @@ def retrieval_node(state: QAState) -> dict:
     plan = state.get("plan", "")
     sub_questions = state.get("sub_questions", [])
     
-    # Debug logging
-    print("\n" + "="*70)
-    print("📚 RETRIEVAL NODE - Enhanced with Planning")
-    print("="*70)
-    print(f"Original Question: {question}")
-    print(f"Has Plan: {bool(plan)}")
-    print(f"Sub-questions: {len(sub_questions) if sub_questions else 0}")
-    print("="*70)
+    logger.debug(
+        "Retrieval for %r: has_plan=%s sub_questions=%d",
+        question,
+        bool(plan),
+        len(sub_questions) if sub_questions else 0,
+    )
     
     # Build enhanced retrieval message
     # If we have planning information, use it. Otherwise, use just the question.
@@ -215,36 +259,95 @@ Focus on retrieving diverse, relevant chunks that address all aspects of the que
     else:
         # FALLBACK MODE: No planning available, use original question
         retrieval_message = question
-        print("ℹ️  No planning information available - using direct question")
-    
-    print(f"\n📤 Sending to Retrieval Agent:")
-    print(f"{retrieval_message[:200]}..." if len(retrieval_message) > 200 else retrieval_message)
-    print()
+        logger.debug("No planning information available - using direct question")
     
     # Invoke the retrieval agent
-    result = retrieval_agent.invoke({"messages": [HumanMessage(content=retrieval_message)]})
+    result = await get_agent("retrieval").ainvoke({"messages": [HumanMessage(content=retrieval_message)]})
     
     messages = result.get("messages", [])
-    context = ""
     
-    # Extract context from ToolMessage(s)
-    # Prefer the last ToolMessage content (from retrieval_tool)
-    tool_messages_found = 0
-    for msg in reversed(messages):
-        if isinstance(msg, ToolMessage):
-            context = str(msg.content)
-            tool_messages_found += 1
-            break
+    # Collect the documents from every retrieval tool call (ToolMessage
+    # artifacts), then compress, merge, deduplicate and budget them into one
+    # context.
+    tool_messages = [msg for msg in messages if isinstance(msg, ToolMessage)]
+    tool_messages_found = len(tool_messages)
+    artifacts = [msg.artifact for msg in tool_messages if msg.artifact]
+    compression_ratio = None
+    if artifacts:
+        queries = list(dict.fromkeys([question, *(sub_questions or [])]))
+        docs, compression_ratio = _build_context(artifacts, queries)
+        RETRIEVED_CHUNKS.observe(len(docs), stage="agentic")
+        context = serialize_chunks(docs)
+    else:
+        context = str(tool_messages[-1].content) if tool_messages else ""
     
-    print(f"✓ Retrieved context: {len(context)} characters")
-    print(f"✓ Tool messages found: {tool_messages_found}")
-    print("="*70 + "\n")
+    CONTEXT_CHARS.observe(len(context))
+    logger.debug(
+        "Retrieved context: %d characters from %d tool message(s)",
+        len(context),
+        tool_messages_found,
+    )
     
     return {
         "context": context,
+        "compression_ratio": compression_ratio,
+    }
+
+async def direct_retrieval_node(state: QAState) -> dict:
+    """Deterministic retrieval node: searches every query in parallel, no LLM.
+
+    This node:
+    - Builds the query list from the original question plus every planned
+      sub-question (deduplicated, order preserved)
+    - Embeds all queries in one batch (reusing `state["question_vector"]`
+      when the question was embedded before the run) and runs the vector
+      searches concurrently via `aretrieve_many`
+    - Compresses each chunk to its most query-relevant sentences, then
+      merges, deduplicates and token-budgets the results with
+      `assemble_context` and serializes them into state["context"]
+
+    Compared to `retrieval_node` this skips the retrieval agent's LLM round
+    trips entirely, trading query reformulation for predictable latency.
+    """
+    question = state["question"]
+    sub_questions = state.get("sub_questions") or []
+    queries = list(dict.fromkeys([question, *sub_questions]))
+
+    # `queries[0]` is always the question itself.
+    vectors = [state.get("question_vector"), *([None] * (len(queries) - 1))]
+    results = await aretrieve_many(queries, vectors=vectors)
+    docs, compression_ratio = _build_context(results, queries)
+    context = serialize_chunks(docs)
+
+    RETRIEVED_CHUNKS.observe(len(docs), stage="direct")
+    CONTEXT_CHARS.observe(len(context))
+    logger.debug(
+        "Direct retrieval: %d queries, %d unique chunks, compression ratio %.2f",
+        len(queries),
+        len(docs),
+        compression_ratio,
+    )
+
+    return {
+        "context": context,
+        "compression_ratio": compression_ratio,
     }
 
-def summarization_node(state: QAState) -> QAState:
+
+NO_CONTEXT_ANSWER = (
+    "I couldn't find relevant information to answer this question. "
+    "Please make sure documents are indexed in Pinecone."
+)
+
+
+def _no_context_answer(state: QAState) -> str:
+    """Answer for an empty context; a timed-out retrieval is not an empty corpus."""
+    if any(d.startswith("retrieval:") for d in state.get("degradations") or []):
+        return RETRIEVAL_TIMEOUT_ANSWER
+    return NO_CONTEXT_ANSWER
+
+
+async def summarization_node(state: QAState) -> QAState:
     """Summarization Agent node: generates draft answer from context.
 
     This node:
@@ -255,44 +358,26 @@ def summarization_node(state: QAState) -> QAState:
     question = state["question"]
     context = state["context"]
 
-    # Debug logging
-    print("\n" + "="*70)
-    print("📝 SUMMARIZATION NODE")
-    print("="*70)
-    print(f"Question: {question}")
-    print(f"Context available: {len(context) if context else 0} characters")
-    
     if not context:
-        print("⚠️  WARNING: No context available!")
-        print("   This means retrieval didn't find anything.")
-        print("   Returning error message.")
-        print("="*70 + "\n")
-        return {
-            "draft_answer": "I couldn't find relevant information to answer this question. Please make sure documents are indexed in Pinecone."
-        }
+        logger.warning("No context retrieved for %r; skipping summarization", question)
+        return {"draft_answer": _no_context_answer(state)}
     
-    print(f"Context preview: {context[:200]}...")
-    print("="*70)
-
     user_content = f"Question: {question}\n\nContext:\n{context}"
 
-    result = summarization_agent.invoke(
+    result = await get_agent("summarization").ainvoke(
         {"messages": [HumanMessage(content=user_content)]}
     )
     messages = result.get("messages", [])
     draft_answer = _extract_last_ai_content(messages)
  
-    #Debug logging
-    print(f"\n✓ Generated draft answer: {len(draft_answer)} characters")
-    print(f"Draft preview: {draft_answer[:150]}...")
-    print("="*70 + "\n")
+    logger.debug("Generated draft answer: %d characters", len(draft_answer))
 
     return {
         "draft_answer": draft_answer,
     }
 
 
-def verification_node(state: QAState) -> QAState:
+async def verification_node(state: QAState) -> QAState:
     """Verification Agent node: verifies and corrects the draft answer.
 
     This node:
@@ -314,8 +399,12 @@ Draft Answer:
 
 Please verify and correct the draft answer, removing any unsupported claims."""
 
-    result = verification_agent.invoke(
-        {"messages": [HumanMessage(content=user_content)]}
+    result = await hedged(
+        "verification",
+        state,
+        lambda: get_agent("verification").ainvoke(
+            {"messages": [HumanMessage(content=user_content)]}
+        ),
     )
     messages = result.get("messages", [])
     answer = _extract_last_ai_content(messages)
@@ -323,3 +412,31 @@ Please verify and correct the draft answer, removing any unsupported claims."""
     return {
         "answer": answer,
     }
+
+
+async def grounded_answer_node(state: QAState) -> QAState:
+    """Grounded Answer node: answers and self-verifies in a single LLM call.
+
+    Used by the "fast" pipeline profile in place of the separate
+    summarization and verification nodes. Stores the result as both
+    `draft_answer` and the final `answer`.
+    """
+    question = state["question"]
+    context = state.get("context") or ""
+
+    if not context:
+        logger.warning("No context retrieved for %r; skipping answer generation", question)
+        answer = _no_context_answer(state)
+        return {"draft_answer": answer, "answer": answer}
+
+    user_content = f"Question: {question}\n\nContext:\n{context}"
+
+    result = await get_agent("grounded_answer").ainvoke(
+        {"messages": [HumanMessage(content=user_content)]}
+    )
+    answer = _extract_last_ai_content(result.get("messages", []))
+
+    return {
+        "draft_answer": answer,
+        "answer": answer,
+    }
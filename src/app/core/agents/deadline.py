@@ -0,0 +1,214 @@
+"""Deadline handling for the QA graph: budgets, stage timeouts and hedging.
+
+Every request carries an absolute `deadline` in its state. `with_deadline`
+wraps a graph node so that it runs for at most
+`min(<stage>_timeout_seconds, time left)`; when a stage times out, or would
+start with less time left than it usually takes, the node's fallback is
+returned instead and the degradation is appended to `state["degradations"]`
+(e.g. "verification:skipped_budget" returns the summarization draft).
+
+`hedged` runs a short LLM call and, if it is still pending after the
+observed p95 latency of that stage's LLM calls, starts an identical second
+call and uses whichever finishes first. Call latencies are tracked apart
+from stage latencies, which also cover work done without an LLM call (e.g.
+plan cache hits) and would make every real call look slow.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from ..config import get_settings
+from ..metrics import REGISTRY
+from .state import QAState
+
+T = TypeVar("T")
+Node = Callable[[QAState], Awaitable[dict]]
+
+TIMEOUT_ANSWER = (
+    "I couldn't produce an answer within the time limit for this request. "
+    "Please try again."
+)
+RETRIEVAL_TIMEOUT_ANSWER = (
+    "I couldn't search the documents within the time limit for this request. "
+    "Please try again."
+)
+
+DEGRADATIONS = REGISTRY.counter(
+    "ikms_degradations_total",
+    "QA stages replaced by their fallback, by stage and reason.",
+    labels=("stage", "reason"),
+)
+HEDGED_CALLS = REGISTRY.counter(
+    "ikms_hedged_calls_total",
+    "Hedged LLM calls by stage and which call won.",
+    labels=("stage", "winner"),
+)
+
+
+class StageLatencies:
+    """Rolling window of recent durations, per stage.
+
+    Runs cut short by a timeout are recorded with the time they took, so
+    that slow runs still count towards the p95.
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[stage].append(seconds)
+
+    def p95(self, stage: str) -> Optional[float]:
+        """The stage's p95 latency, or `None` until enough samples exist."""
+        with self._lock:
+            samples = sorted(self._samples[stage])
+        if len(samples) < get_settings().hedge_min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+
+STAGE_LATENCIES = StageLatencies()
+# Durations of the primary LLM call made through `hedged`, per stage.
+CALL_LATENCIES = StageLatencies()
+
+
+def new_deadline(budget_seconds: Optional[float] = None) -> Optional[float]:
+    """Absolute `time.monotonic()` deadline for a request (None = unbounded).
+
+    Args:
+        budget_seconds: Latency budget; defaults to
+            `Settings.qa_latency_budget_seconds` (0 disables the deadline).
+    """
+    if budget_seconds is None:
+        budget_seconds = get_settings().qa_latency_budget_seconds
+    if budget_seconds <= 0:
+        return None
+    return time.monotonic() + budget_seconds
+
+
+def time_left(state: QAState) -> Optional[float]:
+    """Seconds until the request's deadline (None when unbounded)."""
+    deadline = state.get("deadline")
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def _skip_planning(state: QAState) -> dict:
+    return {"plan": None, "complexity": None, "sub_questions": None}
+
+
+def _empty_context(state: QAState) -> dict:
+    # The answering nodes reply with RETRIEVAL_TIMEOUT_ANSWER, not the
+    # "nothing indexed" answer, when this degradation is recorded.
+    return {"context": "", "compression_ratio": None}
+
+
+def _timeout_draft(state: QAState) -> dict:
+    return {"draft_answer": TIMEOUT_ANSWER}
+
+
+def _keep_draft(state: QAState) -> dict:
+    return {"answer": state.get("draft_answer") or TIMEOUT_ANSWER}
+
+
+def _timeout_answer(state: QAState) -> dict:
+    return {"draft_answer": TIMEOUT_ANSWER, "answer": TIMEOUT_ANSWER}
+
+
+# Fallback of every stage and whether it may be skipped up front when the
+# time left is below the stage's p95 latency.
+FALLBACKS: Dict[str, tuple[Callable[[QAState], dict], bool]] = {
+    "planning": (_skip_planning, True),
+    "retrieval": (_empty_context, False),
+    "summarization": (_timeout_draft, False),
+    "verification": (_keep_draft, True),
+    "answer": (_timeout_answer, False),
+}
+
+
+def _degrade(stage: str, reason: str, state: QAState) -> dict:
+    DEGRADATIONS.inc(stage=stage, reason=reason)
+    fallback, _ = FALLBACKS[stage]
+    return {**fallback(state), "degradations": [f"{stage}:{reason}"]}
+
+
+def with_deadline(stage: str) -> Callable[[Node], Node]:
+    """Decorate an async graph node with the stage timeout and fallback."""
+
+    def decorator(func: Node) -> Node:
+        @functools.wraps(func)
+        async def wrapper(state: QAState) -> dict:
+            settings = get_settings()
+            timeout = getattr(settings, f"{stage}_timeout_seconds")
+            left = time_left(state)
+            if left is not None:
+                _, skippable = FALLBACKS[stage]
+                typical = STAGE_LATENCIES.p95(stage) or 0.0
+                if left <= 0 or (skippable and left < typical):
+                    return _degrade(stage, "skipped_budget", state)
+                timeout = min(timeout, left) if timeout > 0 else left
+
+            start = time.monotonic()
+            try:
+                if timeout > 0:
+                    update = await asyncio.wait_for(func(state), timeout)
+                else:
+                    update = await func(state)
+            except TimeoutError:
+                STAGE_LATENCIES.observe(stage, time.monotonic() - start)
+                return _degrade(stage, "timeout", state)
+            STAGE_LATENCIES.observe(stage, time.monotonic() - start)
+            return update
+
+        return wrapper
+
+    return decorator
+
+
+async def hedged(stage: str, state: QAState, call: Callable[[], Awaitable[T]]) -> T:
+    """Await `call()`, hedging with a second call after its observed p95.
+
+    Hedging is disabled by `Settings.hedging_enabled` or `state["hedging"]`,
+    and until the stage has `Settings.hedge_min_samples` call latency
+    samples. Every primary call is sampled, including ones cancelled by a
+    timeout or a faster backup (with the time they had taken by then). The
+    losing call is cancelled; if one call fails, the other one's result is
+    used.
+    """
+    delay = None
+    if get_settings().hedging_enabled and state.get("hedging", True):
+        delay = CALL_LATENCIES.p95(stage)
+
+    start = time.monotonic()
+    primary = asyncio.ensure_future(call())
+    primary.add_done_callback(
+        lambda _: CALL_LATENCIES.observe(stage, time.monotonic() - start)
+    )
+    tasks = {primary}
+    try:
+        if delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return primary.result()
+
+        backup = asyncio.ensure_future(call())
+        tasks.add(backup)
+        pending = set(tasks)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None or not pending:
+                    HEDGED_CALLS.inc(stage=stage, winner="primary" if task is primary else "backup")
+                    return task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -1,43 +1,111 @@
-"""LangGraph orchestration for the linear multi-agent QA flow."""
+"""LangGraph orchestration for the linear multi-agent QA flow.
 
+Graphs are compiled once, on first use, by `get_qa_graph` /
+`get_fast_qa_graph`; LangGraph itself is imported at that point.
+"""
+
+import asyncio
 from functools import lru_cache
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
-from langgraph.constants import END, START
-from langgraph.graph import StateGraph
+from langchain_core.callbacks import BaseCallbackHandler
 
-from .agents import retrieval_node, summarization_node, verification_node
+from ..config import get_settings
+from ..llm.callbacks import LLM_METRICS_HANDLER, graph_stage
+from ..metrics import timed_node
+from .agents import (
+    direct_retrieval_node,
+    grounded_answer_node,
+    retrieval_node,
+    summarization_node,
+    verification_node,
+)
 from .state import QAState
 from .agents import planning_agent_node
+from .deadline import new_deadline, with_deadline
+from .grounding import grounding_node, next_after_grounding
+from .routing import next_after_routing, routing_node
+
+def _stage(name: str, node: Any) -> Any:
+    """Wrap a node with its deadline handling and latency metrics."""
+    return timed_node(name)(with_deadline(name)(node))
+
 
 def create_qa_graph() -> Any:
     """Create and compile the linear multi-agent QA graph.
 
     The graph executes in order:
-    1. Retrieval Agent: gathers context from vector store
-    2. Summarization Agent: generates draft answer from context
-    3. Verification Agent: verifies and corrects the answer
+    1. Routing: a local complexity check decides whether to plan
+    2. Planning Agent (complex questions only): plan and sub-questions
+    3. Retrieval Agent: gathers context from vector store
+    4. Summarization Agent: generates draft answer from context
+    5. Grounding: a local overlap check promotes well-supported drafts
+    6. Verification Agent (low-support drafts only): corrects the answer
+
+    The retrieval step is selected by `Settings.retrieval_mode`: the
+    agentic `retrieval_node` or the LLM-free `direct_retrieval_node`.
 
     Returns:
         Compiled graph ready for execution.
     """
+    from langgraph.graph import END, START, StateGraph
+
     builder = StateGraph(QAState)
 
-    # Add nodes for each agent
-    builder.add_node("retrieval", retrieval_node)
-    builder.add_node("summarization", summarization_node)
-    builder.add_node("verification", verification_node)
-    builder.add_node("planning", planning_agent_node)
+    if get_settings().retrieval_mode == "direct":
+        retrieval = direct_retrieval_node
+    else:
+        retrieval = retrieval_node
 
-    # Define linear flow: START -> retrieval -> summarization -> verification -> END
-    builder.add_edge(START, "planning")
+    # Add nodes for each agent, each instrumented with latency metrics; the
+    # LLM/vector-store stages also get their timeout and fallback
+    builder.add_node("retrieval", _stage("retrieval", retrieval))
+    builder.add_node("summarization", _stage("summarization", summarization_node))
+    builder.add_node("verification", _stage("verification", verification_node))
+    builder.add_node("planning", _stage("planning", planning_agent_node))
+    builder.add_node("routing", timed_node("routing")(routing_node))
+    builder.add_node("grounding", timed_node("grounding")(grounding_node))
+
+    # START -> routing -> [planning ->] retrieval -> summarization
+    #       -> grounding -> [verification ->] END
+    builder.add_edge(START, "routing")
+    builder.add_conditional_edges(
+        "routing", next_after_routing, {"planning": "planning", "retrieval": "retrieval"}
+    )
     builder.add_edge("planning", "retrieval")
     builder.add_edge("retrieval", "summarization")
-    builder.add_edge("summarization", "verification")
+    builder.add_edge("summarization", "grounding")
+    builder.add_conditional_edges(
+        "grounding", next_after_grounding, {"verification": "verification", "end": END}
+    )
     builder.add_edge("verification", END)
 
     return builder.compile()
-app = create_qa_graph()
+
+
+def create_fast_qa_graph() -> Any:
+    """Create and compile the latency-optimised "fast" QA graph.
+
+    The graph executes in order:
+    1. Direct retrieval: searches the question without any LLM hop
+    2. Grounded Answer Agent: answers and self-verifies in one LLM call
+
+    Returns:
+        Compiled graph ready for execution.
+    """
+    from langgraph.graph import END, START, StateGraph
+
+    builder = StateGraph(QAState)
+
+    builder.add_node("retrieval", _stage("retrieval", direct_retrieval_node))
+    builder.add_node("answer", _stage("answer", grounded_answer_node))
+
+    builder.add_edge(START, "retrieval")
+    builder.add_edge("retrieval", "answer")
+    builder.add_edge("answer", END)
+
+    return builder.compile()
+
 
 @lru_cache(maxsize=1)
 def get_qa_graph() -> Any:
@@ -45,32 +113,262 @@ def get_qa_graph() -> Any:
     return create_qa_graph()
 
 
-def run_qa_flow(question: str) -> Dict[str, Any]:
-    """Run the complete multi-agent QA flow for a question.
+@lru_cache(maxsize=1)
+def get_fast_qa_graph() -> Any:
+    """Get the compiled fast QA graph instance (singleton via LRU cache)."""
+    return create_fast_qa_graph()
+
+
+def _graph_for_mode(mode: str) -> Any:
+    """Return the compiled graph for a pipeline profile ("full" or "fast")."""
+    if mode == "fast":
+        return get_fast_qa_graph()
+    if mode == "full":
+        return get_qa_graph()
+    raise ValueError(f"Unknown QA mode: {mode!r}")
+
+
+def reuses_question_vector(mode: str) -> bool:
+    """Whether the graph for `mode` retrieves with a precomputed question vector.
+
+    True when retrieval is direct (always in the fast profile); the agentic
+    retrieval agent writes its own queries, so a question vector is unused.
+    """
+    return mode == "fast" or get_settings().retrieval_mode == "direct"
+
+
+def _initial_state(
+    question: str,
+    latency_budget: Optional[float] = None,
+    hedging: bool = True,
+    question_vector: Optional[List[float]] = None,
+) -> QAState:
+    """Build the initial graph state for a question.
+
+    `latency_budget` (seconds) defaults to `Settings.qa_latency_budget_seconds`;
+    0 disables the request deadline (stage timeouts still apply).
+    `question_vector` is the question's embedding when the caller already
+    computed it (see `reuses_question_vector`).
+    """
+    return {
+        "question": question,
+        "question_vector": question_vector,
+        "context": None,
+        "draft_answer": None,
+        "answer": None,
+        "plan": None,
+        "sub_questions": None,
+        "complexity": None,
+        "route": None,
+        "compression_ratio": None,
+        "grounding_score": None,
+        "verification_skipped": None,
+        "deadline": new_deadline(latency_budget),
+        "degradations": [],
+        "hedging": hedging,
+    }
+
+
+def _run_config(callbacks: Optional[List[BaseCallbackHandler]] = None) -> Dict[str, Any]:
+    """Build the run config, always attaching the LLM metrics handler."""
+    return {"callbacks": [LLM_METRICS_HANDLER, *(callbacks or [])]}
+
+
+async def arun_qa_flow(
+    question: str,
+    callbacks: Optional[List[BaseCallbackHandler]] = None,
+    mode: str = "full",
+    latency_budget: Optional[float] = None,
+    question_vector: Optional[List[float]] = None,
+) -> Dict[str, Any]:
+    """Run the complete multi-agent QA flow for a question asynchronously.
 
     This is the main entry point for the QA system. It:
     1. Initializes the graph state with the question
-    2. Executes the linear agent flow (Retrieval -> Summarization -> Verification)
+    2. Executes the agent flow (Planning -> Retrieval -> Summarization -> Verification)
+       with `graph.ainvoke`, so LLM round trips yield to the event loop
     3. Extracts and returns the final results
 
     Args:
         question: The user's question about the vector databases paper.
+        callbacks: Optional LangChain callback handlers attached to the run
+            (e.g. for per-node timing in benchmarks).
+        mode: Pipeline profile, "full" (multi-agent) or "fast" (direct
+            retrieval plus a single grounded-answer call).
+        latency_budget: Seconds the request may take before stages fall
+            back (defaults to `Settings.qa_latency_budget_seconds`).
+        question_vector: The question's embedding, if already computed;
+            direct retrieval then skips embedding the question again.
 
     Returns:
         Dictionary with keys:
         - `answer`: Final verified answer
         - `draft_answer`: Initial draft answer from summarization agent
         - `context`: Retrieved context from vector store
+        - `plan` / `sub_questions`: Output of the planning agent
+        - `degradations`: Stages that fell back to meet the deadline
     """
-    graph = get_qa_graph()
+    graph = _graph_for_mode(mode)
+    return await graph.ainvoke(
+        _initial_state(question, latency_budget, question_vector=question_vector),
+        config=_run_config(callbacks),
+    )
+
+
+async def arun_qa_batch(
+    questions: Sequence[str],
+    mode: str = "full",
+    max_concurrency: int | None = None,
+    callbacks: Optional[List[BaseCallbackHandler]] = None,
+    question_vectors: Optional[Sequence[Optional[List[float]]]] = None,
+) -> List[Dict[str, Any] | Exception]:
+    """Run the QA flow for several questions with `graph.abatch`.
+
+    At most `max_concurrency` questions run through the graph at once
+    (defaults to `Settings.qa_batch_max_concurrency`). A failing question
+    does not abort the batch: its exception is returned in its slot.
+    Batched questions have no request deadline, since they may queue for a
+    while before they start; per-stage timeouts still apply.
+
+    Args:
+        questions: The questions to answer.
+        mode: Pipeline profile, "full" or "fast" (see `arun_qa_flow`).
+        max_concurrency: Upper bound on concurrently running graphs.
+        callbacks: Optional LangChain callback handlers attached to every run.
+        question_vectors: Optional precomputed question embeddings, aligned
+            with `questions` (see `arun_qa_flow`).
+
+    Returns:
+        One final state (or exception) per question, in input order.
+    """
+    if not questions:
+        return []
+    if max_concurrency is None:
+        max_concurrency = get_settings().qa_batch_max_concurrency
+
+    if question_vectors is None:
+        question_vectors = [None] * len(questions)
+
+    graph = _graph_for_mode(mode)
+    config = {**_run_config(callbacks), "max_concurrency": max_concurrency}
+    return await graph.abatch(
+        [
+            _initial_state(question, latency_budget=0, question_vector=vector)
+            for question, vector in zip(questions, question_vectors)
+        ],
+        config=config,
+        return_exceptions=True,
+    )
 
-    initial_state: QAState = {
-        "question": question,
-        "context": None,
-        "draft_answer": None,
-        "answer": None,
-    }
 
-    final_state = graph.invoke(initial_state)
+async def astream_qa_flow(
+    question: str,
+    mode: str = "full",
+    latency_budget: Optional[float] = None,
+    question_vector: Optional[List[float]] = None,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Run the QA flow and yield progress events as each stage completes.
 
-    return final_state
+    Built on `graph.astream_events`, this yields `(event, data)` tuples:
+    - `("plan", {"plan", "sub_questions"})` when the planning node finishes
+      (with empty values right after routing when planning is skipped)
+    - `("context", {"context"})` when the retrieval node finishes
+    - `("token", {"text"})` for every token of the final (verified) answer;
+      a grounded draft that skips verification, or a fallback answer, is
+      sent as a single token
+    - `("replace", {"text"})` when the answering stage timed out after some
+      of its tokens were sent; the text is the fallback answer, which
+      replaces everything streamed so far
+    - `("answer", final_state)` once the graph has finished
+
+    Args:
+        question: The user's question about the vector databases paper.
+        mode: Pipeline profile, "full" or "fast" (see `arun_qa_flow`).
+        latency_budget: Request deadline in seconds (see `arun_qa_flow`).
+        question_vector: The question's embedding, if already computed.
+
+    Yields:
+        Tuples of event name and JSON-serializable payload.
+    """
+    graph = _graph_for_mode(mode)
+    final_state: Dict[str, Any] = {}
+    streamed = False
+
+    if mode == "fast":
+        # The fast profile never plans.
+        yield "plan", {"plan": None, "sub_questions": None}
+
+    async for event in graph.astream_events(
+        _initial_state(
+            question, latency_budget, hedging=False, question_vector=question_vector
+        ),
+        config=_run_config(),
+        version="v2",
+    ):
+        kind = event["event"]
+        name = event.get("name")
+        node = event.get("metadata", {}).get("langgraph_node")
+
+        if kind == "on_chat_model_stream" and graph_stage(event.get("metadata")) in (
+            "verification",
+            "answer",
+        ):
+            content = event["data"]["chunk"].content
+            if isinstance(content, str) and content:
+                streamed = True
+                yield "token", {"text": content}
+        elif kind != "on_chain_end":
+            continue
+        elif not event.get("parent_ids"):
+            final_state = event["data"]["output"]
+        elif name == "routing" and node == "routing":
+            if event["data"]["output"].get("route") != "planning":
+                yield "plan", {"plan": None, "sub_questions": None}
+        elif name == "grounding" and node == "grounding":
+            output = event["data"]["output"]
+            if output.get("verification_skipped"):
+                yield "token", {"text": output.get("answer") or ""}
+        elif name in ("verification", "answer") and node == name:
+            output = event["data"]["output"]
+            if output.get("degradations"):
+                # Tokens of the timed-out call may already be out.
+                yield "replace" if streamed else "token", {"text": output.get("answer") or ""}
+        elif name == "planning" and node == "planning":
+            output = event["data"]["output"]
+            yield "plan", {
+                "plan": output.get("plan"),
+                "complexity": output.get("complexity"),
+                "sub_questions": output.get("sub_questions"),
+            }
+        elif name == "retrieval" and node == "retrieval":
+            yield "context", {"context": event["data"]["output"].get("context")}
+
+    yield "answer", final_state
+
+
+def run_qa_flow(
+    question: str,
+    mode: str = "full",
+    latency_budget: Optional[float] = None,
+    question_vector: Optional[List[float]] = None,
+) -> Dict[str, Any]:
+    """Run the complete multi-agent QA flow for a question synchronously.
+
+    Convenience wrapper around `arun_qa_flow` for scripts and notebooks that
+    are not already running inside an event loop. Code running inside an
+    event loop (e.g. FastAPI handlers) must await `arun_qa_flow` instead.
+
+    Args:
+        question: The user's question about the vector databases paper.
+        mode: Pipeline profile, "full" or "fast" (see `arun_qa_flow`).
+        latency_budget: Request deadline in seconds (see `arun_qa_flow`).
+        question_vector: The question's embedding, if already computed.
+
+    Returns:
+        Same dictionary as `arun_qa_flow`.
+    """
+    return asyncio.run(
+        arun_qa_flow(
+            question, mode=mode, latency_budget=latency_budget, question_vector=question_vector
+        )
+    )
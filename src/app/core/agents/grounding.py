@@ -0,0 +1,96 @@
+"""Local grounding check between summarization and verification.
+
+Measures how well each sentence ("claim") of the draft answer is supported
+by the retrieved context using word and bigram overlap. Drafts whose claims
+are well supported skip the verification LLM call; only low-support drafts
+are sent to the verification agent.
+"""
+
+import re
+from typing import List, Set, Tuple
+
+from ..config import get_settings
+from ..metrics import REGISTRY
+from .state import QAState
+
+VERIFICATION_OUTCOMES = REGISTRY.counter(
+    "ikms_verification_total",
+    "Drafts by verification outcome (invoked or skipped as grounded).",
+    labels=("outcome",),
+)
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:['-][a-z0-9]+)*")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "for", "from",
+    "has", "have", "in", "is", "it", "its", "of", "on", "or", "that", "the",
+    "their", "these", "they", "this", "to", "was", "were", "which", "with",
+}
+
+
+def _content_words(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _bigrams(words: List[str]) -> Set[Tuple[str, str]]:
+    return set(zip(words, words[1:]))
+
+
+def grounding_score(draft: str, context: str, claim_support: float) -> float:
+    """Fraction of draft sentences supported by the context.
+
+    A sentence counts as supported when, averaged over its content words and
+    content-word bigrams, at least `claim_support` of them occur in the
+    context. Sentences without content words are ignored.
+    """
+    context_words = _content_words(context)
+    vocabulary = set(context_words)
+    context_bigrams = _bigrams(context_words)
+
+    supported = total = 0
+    for sentence in _SENTENCE_RE.split(draft):
+        words = _content_words(sentence)
+        if not words:
+            continue
+        total += 1
+        unigram = sum(1 for w in words if w in vocabulary) / len(words)
+        bigrams = _bigrams(words)
+        bigram = (
+            len(bigrams & context_bigrams) / len(bigrams) if bigrams else unigram
+        )
+        if (unigram + bigram) / 2 >= claim_support:
+            supported += 1
+    return supported / total if total else 0.0
+
+
+async def grounding_node(state: QAState) -> dict:
+    """Grounding node: decides whether the draft needs LLM verification.
+
+    When the draft is well supported by the context (or there is no context
+    to verify against, or no real draft because summarization fell back) it
+    is promoted to the final `answer` directly and `verification_skipped` is
+    set.
+    """
+    settings = get_settings()
+    draft = state.get("draft_answer") or ""
+    context = state.get("context") or ""
+    degradations = state.get("degradations") or []
+
+    if not context or any(d.startswith("summarization:") for d in degradations):
+        score, skip = 0.0, True
+    elif not settings.grounding_check_enabled:
+        score, skip = 0.0, False
+    else:
+        score = grounding_score(draft, context, settings.grounding_claim_support)
+        skip = score >= settings.grounding_threshold
+
+    VERIFICATION_OUTCOMES.inc(outcome="skipped" if skip else "invoked")
+    update: dict = {"grounding_score": score, "verification_skipped": skip}
+    if skip:
+        update["answer"] = draft
+    return update
+
+
+def next_after_grounding(state: QAState) -> str:
+    """Conditional edge: END for grounded drafts, otherwise verification."""
+    return "end" if state.get("verification_skipped") else "verification"
@@ -0,0 +1,105 @@
+"""Structured planning output and the plan cache.
+
+The planning agent answers with `PlanningOutput` (schema-constrained
+structured output) instead of free text, so no line scraping is needed.
+Plans depend only on the question, so they are cached by a normalized
+question key: repeated or near-identical questions (differing only in
+case, punctuation or whitespace) skip the planning LLM call.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from ..config import get_settings
+from ..metrics import REGISTRY
+
+# Words of a plan cache key; everything else counts as a separator.
+_KEY_WORD_RE = re.compile(r"\w+")
+
+# Sub-questions kept per plan (each one costs a retrieval call).
+MAX_SUB_QUESTIONS = 5
+
+PLAN_CACHE_LOOKUPS = REGISTRY.counter(
+    "ikms_plan_cache_lookups_total", "Plan cache lookups by result.", labels=("result",)
+)
+
+
+class PlanningOutput(BaseModel):
+    """Search plan for a user question."""
+
+    plan: str = Field(description="Brief strategy for how to search for the information.")
+    complexity: Literal["simple", "moderate", "complex"] = Field(
+        description="simple: one concept; moderate: one concept from several angles; "
+        "complex: several distinct parts."
+    )
+    sub_questions: List[str] = Field(
+        description="1-5 focused, keyword-style search queries, one concept each."
+    )
+
+    def cleaned_sub_questions(self) -> List[str]:
+        """Sub-questions stripped, deduplicated and capped at `MAX_SUB_QUESTIONS`."""
+        cleaned = (sub.strip().strip("\"'") for sub in self.sub_questions)
+        return list(dict.fromkeys(sub for sub in cleaned if sub))[:MAX_SUB_QUESTIONS]
+
+
+def plan_key(question: str) -> str:
+    """Cache key: the question's words, lower-cased, in order.
+
+    Question words such as "how" and "why" are kept: they change the plan.
+    """
+    return " ".join(_KEY_WORD_RE.findall(question.lower()))
+
+
+class PlanCache:
+    """Thread-safe LRU cache of plans with a TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[float, PlanningOutput]]" = OrderedDict()
+
+    def get(self, question: str) -> Optional[PlanningOutput]:
+        key = plan_key(question)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        PLAN_CACHE_LOOKUPS.inc(result="hit" if entry is not None else "miss")
+        return entry[1] if entry is not None else None
+
+    def put(self, question: str, output: PlanningOutput) -> None:
+        key = plan_key(question)
+        if not key:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), output)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache(maxsize=1)
+def get_plan_cache() -> PlanCache:
+    """Get the process-wide plan cache sized from settings."""
+    settings = get_settings()
+    cache = PlanCache(settings.plan_cache_max_entries, settings.plan_cache_ttl_seconds)
+    REGISTRY.register_collector(
+        "ikms_plan_cache_entries",
+        "Plans currently held in the plan cache.",
+        "gauge",
+        lambda: [("ikms_plan_cache_entries", {}, len(cache))],
+    )
+    return cache
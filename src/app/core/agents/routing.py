@@ -0,0 +1,67 @@
+"""Cheap local routing for the QA graph.
+
+Decides, without any LLM call, whether a question is complex enough to be
+worth a planning round trip. Simple, single-concept questions ("What is
+HNSW indexing?") go straight to retrieval; multi-part or comparative
+questions are sent through the planning agent.
+"""
+
+import re
+
+from ..config import get_settings
+from ..metrics import REGISTRY
+from .state import QAState
+
+ROUTES = REGISTRY.counter(
+    "ikms_route_total", "Questions by routing decision.", labels=("route",)
+)
+
+_WORD_RE = re.compile(r"\b[\w'-]+\b")
+_CONJUNCTIONS = {"and", "or", "but", "also", "while", "whereas", "both"}
+_COMPARISON_WORDS = {
+    "compare", "compared", "comparison", "versus", "vs", "difference",
+    "differences", "differ", "better", "worse", "than", "advantages",
+    "disadvantages", "tradeoffs", "trade-offs", "pros", "cons",
+}
+
+
+def question_complexity(question: str) -> int:
+    """Score how many separate aspects a question seems to ask about.
+
+    Each signal adds to the score: length, conjunctions, comparison words,
+    multiple question marks and comma-separated clauses.
+    """
+    words = [word.lower() for word in _WORD_RE.findall(question)]
+    score = 0
+    if len(words) > 15:
+        score += 1
+    if len(words) > 30:
+        score += 1
+    score += sum(1 for word in words if word in _CONJUNCTIONS)
+    score += 2 * sum(1 for word in words if word in _COMPARISON_WORDS)
+    score += 2 * max(0, question.count("?") - 1)
+    score += question.count(",") + question.count(";")
+    return score
+
+
+async def routing_node(state: QAState) -> dict:
+    """Route node: records whether the question needs planning.
+
+    Writes `route` = "planning" for complex questions and "direct" for
+    simple ones (or always "planning" when conditional planning is off).
+    """
+    settings = get_settings()
+    if not settings.conditional_planning_enabled:
+        route = "planning"
+    elif question_complexity(state["question"]) >= settings.planning_complexity_threshold:
+        route = "planning"
+    else:
+        route = "direct"
+
+    ROUTES.inc(route=route)
+    return {"route": route}
+
+
+def next_after_routing(state: QAState) -> str:
+    """Conditional edge: the node to run after `routing_node`."""
+    return "planning" if state.get("route") == "planning" else "retrieval"
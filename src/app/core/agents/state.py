@@ -1,6 +1,7 @@
 """LangGraph state schema for the multi-agent QA flow."""
 
-from typing import TypedDict
+import operator
+from typing import Annotated, TypedDict
 
 
 class QAState(TypedDict):
@@ -13,8 +14,28 @@ class QAState(TypedDict):
     """
 
     question: str
+    # Embedding of `question` computed before the run (e.g. for answer-cache
+    # lookups); direct retrieval reuses it instead of embedding it again
+    question_vector: list[float] | None
     context: str | None
     draft_answer: str | None
     answer: str | None
     plan: str | None
     sub_questions: list[str] | None
+    # Planner's assessment: "simple", "moderate" or "complex"
+    complexity: str | None
+    # "planning" or "direct" (planning skipped for a simple question)
+    route: str | None
+    # Compressed / original context size (1.0 when compression is off)
+    compression_ratio: float | None
+    # Share of draft sentences supported by the context (local check)
+    grounding_score: float | None
+    # True when the draft was grounded enough to skip the verification agent
+    verification_skipped: bool | None
+    # Absolute `time.monotonic()` deadline of the request (None = unbounded)
+    deadline: float | None
+    # Stages replaced by their fallback, e.g. "verification:timeout"
+    degradations: Annotated[list[str], operator.add]
+    # Whether short LLM calls may be hedged (off while streaming tokens, so
+    # two concurrent calls never interleave their output)
+    hedging: bool | None
@@ -3,6 +3,7 @@ Test the planning agent independently
 Run this to make sure it works before integrating into graph
 """
 
+import asyncio
 import os
 from dotenv import load_dotenv
 from src.app.core.agents.agents import planning_agent_node
@@ -36,7 +37,7 @@ def test_planning():
         }
         
         # Run planning node
-        result = planning_agent_node(state)
+        result = asyncio.run(planning_agent_node(state))
         
         print(f"✓ Planning complete!")
         print(f"Plan: {result['plan'][:200]}...")
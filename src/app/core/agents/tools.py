@@ -4,6 +4,7 @@ from langchain_core.tools import tool
 
 from ..retrieval.vector_store import retrieve
 from ..retrieval.serialization import serialize_chunks
+from ..metrics import RETRIEVED_CHUNKS
 
 
 @tool(response_format="content_and_artifact")
@@ -25,6 +26,7 @@ def retrieval_tool(query: str):
     """
     # Retrieve documents from vector store
     docs = retrieve(query, k=4)
+    RETRIEVED_CHUNKS.observe(len(docs), stage="tool")
 
     # Serialize chunks into formatted string (content)
     context = serialize_chunks(docs)
@@ -4,23 +4,155 @@ This module uses Pydantic Settings to load and validate environment variables
 for OpenAI models, Pinecone settings, and other system parameters.
 """
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
+    # Logging Configuration (DEBUG enables per-node pipeline traces)
+    log_level: str = "INFO"
+
+    # Model Provider Configuration
+    # "openai" or "fake" (deterministic offline models for load testing).
+    llm_provider: Literal["openai", "fake"] = "openai"
+    fake_llm_latency_ms: float = 0.0
+    fake_embedding_latency_ms: float = 0.0
+    fake_embedding_dimensions: int = 1536
+
     # OpenAI Configuration
-    openai_api_key: str
+    openai_api_key: str = ""
     openai_model_name: str = "gpt-4o-mini"
     openai_embedding_model_name: str = "text-embedding-3-small"
 
+    # Outbound HTTP pool shared by every OpenAI chat/embeddings client
+    # (one sync and one async pool, keep-alive; HTTP/2 when `h2` is installed)
+    llm_http_max_connections: int = 100
+    llm_http_max_keepalive_connections: int = 20
+    llm_http_keepalive_expiry_seconds: float = 30.0
+    llm_http2: bool = True
+
+    # Vector Store Configuration
+    # "pinecone" (managed, networked) or "local" (memory-mapped NumPy store).
+    vector_store_backend: Literal["pinecone", "local"] = "pinecone"
+    local_vector_store_path: str = "data/vector_store"
+
     # Pinecone Configuration
-    pinecone_api_key: str
-    pinecone_index_name: str
+    pinecone_api_key: str = ""
+    pinecone_index_name: str = ""
 
     # Retrieval Configuration
     retrieval_k: int = 4
+    # "agentic": an LLM agent decides when/how to call the retrieval tool.
+    # "direct": the question and every planned sub-question are searched
+    # concurrently and merged without any LLM round trip.
+    retrieval_mode: Literal["agentic", "direct"] = "agentic"
+
+    # Hybrid Retrieval Configuration
+    # A local BM25 index is built alongside the vector index and both result
+    # lists are merged with reciprocal rank fusion (score = sum 1/(rrf_k+rank)).
+    hybrid_retrieval_enabled: bool = True
+    bm25_index_path: str = "data/bm25_index"
+    rrf_k: int = 60
+
+    # Context Assembly Configuration
+    # Token budget for the context passed to summarization/verification and
+    # relevance-vs-diversity trade-off of the MMR-style chunk ordering.
+    context_token_budget: int = 3000
+    context_mmr_lambda: float = 0.7
+    # Extractive compression: keep only the sentences of each chunk most
+    # similar (TF-IDF) to the question and sub-questions.
+    context_compression_enabled: bool = True
+    context_compression_sentences: int = 3
+
+    # Conditional Planning Configuration
+    # Questions scoring below the threshold skip the planning LLM call.
+    conditional_planning_enabled: bool = True
+    planning_complexity_threshold: int = 2
+
+    # Plan Cache Configuration (plans keyed by the normalized question)
+    plan_cache_enabled: bool = True
+    plan_cache_max_entries: int = 1024
+    plan_cache_ttl_seconds: float = 24 * 3600.0
+
+    # Grounding Check Configuration
+    # Drafts whose share of supported sentences reaches `grounding_threshold`
+    # skip the verification LLM call; a sentence is supported when at least
+    # `grounding_claim_support` of its words/bigrams occur in the context.
+    grounding_check_enabled: bool = True
+    grounding_threshold: float = 0.9
+    grounding_claim_support: float = 0.6
+
+    # Batch QA Configuration (/qa/batch)
+    qa_batch_max_questions: int = 500
+    # Questions of one batch running through the graph at the same time.
+    qa_batch_max_concurrency: int = 8
+
+    # Deadline Configuration
+    # Per-request latency budget (0 disables it). Each stage runs for at most
+    # min(<stage>_timeout_seconds, time left) before its fallback is used.
+    qa_latency_budget_seconds: float = 30.0
+    planning_timeout_seconds: float = 8.0
+    retrieval_timeout_seconds: float = 10.0
+    summarization_timeout_seconds: float = 15.0
+    verification_timeout_seconds: float = 10.0
+    answer_timeout_seconds: float = 15.0
+    # Planning/verification calls still pending after the p95 latency of
+    # that stage's LLM calls (known once `hedge_min_samples` calls were
+    # seen) are hedged with a second identical call.
+    hedging_enabled: bool = True
+    hedge_min_samples: int = 20
+
+    # Admission Control Configuration (per endpoint: requests running at
+    # once and requests allowed to wait; beyond that, 503 + Retry-After)
+    admission_qa_concurrency: int = 32
+    admission_qa_queue: int = 64
+    admission_qa_stream_concurrency: int = 32
+    admission_qa_stream_queue: int = 64
+    admission_qa_batch_concurrency: int = 2
+    admission_qa_batch_queue: int = 4
+    admission_index_pdf_concurrency: int = 4
+    admission_index_pdf_queue: int = 8
+    admission_queue_timeout_seconds: float = 5.0
+    # Token bucket shared by every chat model call (0 disables); size it to
+    # the provider's requests-per-second quota.
+    llm_requests_per_second: float = 0.0
+    llm_max_burst: int = 10
+
+    # Answer Cache Configuration
+    answer_cache_enabled: bool = True
+    answer_cache_max_entries: int = 512
+    answer_cache_max_bytes: int = 32 * 1024 * 1024
+    answer_cache_ttl_seconds: float = 3600.0
+    # Cosine similarity above which a previously answered question is reused.
+    answer_cache_similarity_threshold: float = 0.95
+
+    # Embedding Cache Configuration (content-addressed, on disk)
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str = "data/embedding_cache.sqlite3"
+    embedding_cache_max_entries: int = 200_000
+
+    # PDF Extraction Configuration
+    # "pypdf" (pure Python, single-threaded) or "pymupdf" (native, parallel).
+    pdf_loader_backend: Literal["pypdf", "pymupdf"] = "pymupdf"
+    pdf_loader_workers: int = 4
+    # Documents with fewer pages are extracted in-process (no pool start-up).
+    pdf_parallel_min_pages: int = 64
+
+    # Upload Configuration
+    upload_dir: str = "data/uploads"
+    upload_max_bytes: int = 100 * 1024 * 1024
+    upload_chunk_size: int = 1024 * 1024
+
+    # Indexing Job Configuration
+    indexing_max_workers: int = 2
+    # Jobs waiting for a worker beyond this limit are rejected.
+    indexing_max_queued_jobs: int = 16
+    # Finished jobs kept around for status polling.
+    indexing_job_history: int = 100
+    indexing_batch_size: int = 64
 
     model_config = SettingsConfigDict(
         env_file=".env",
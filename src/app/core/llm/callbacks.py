@@ -0,0 +1,67 @@
+"""LangChain callback handlers that feed LLM metrics into the registry."""
+
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from ..metrics import LLM_LATENCY, LLM_TOKENS
+
+
+def graph_stage(metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Return the top-level QA graph node a run belongs to.
+
+    Agents are `create_agent` subgraphs, so inside them `langgraph_node` is
+    the agent's own node (e.g. "model"); the stage is the first segment of
+    the checkpoint namespace ("verification:<id>|model:<id>").
+    """
+    metadata = metadata or {}
+    namespace = metadata.get("langgraph_checkpoint_ns")
+    if namespace:
+        return namespace.split("|", 1)[0].split(":", 1)[0]
+    return metadata.get("langgraph_node")
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """Records latency and prompt/completion tokens of every chat model call.
+
+    Calls are labelled with the QA graph stage they ran in (see
+    `graph_stage`), so costs can be attributed per pipeline stage.
+    """
+
+    def __init__(self) -> None:
+        self._starts: Dict[UUID, tuple[str, float]] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = graph_stage(metadata) or "unknown"
+        self._starts[run_id] = (node, time.perf_counter())
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._starts.pop(run_id, None)
+        if started is None:
+            return
+        node, start = started
+        LLM_LATENCY.observe(time.perf_counter() - start, node=node)
+
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    LLM_TOKENS.inc(usage.get("input_tokens", 0), node=node, kind="prompt")
+                    LLM_TOKENS.inc(usage.get("output_tokens", 0), node=node, kind="completion")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._starts.pop(run_id, None)
+
+
+LLM_METRICS_HANDLER = LLMMetricsHandler()
@@ -1,22 +1,181 @@
-"""Factory functions for creating LangChain v1 LLM instances."""
+"""Factory functions for creating LangChain v1 LLM instances.
 
-from langchain_openai import ChatOpenAI
+Every OpenAI chat model and embeddings client created here shares one sync
+and one async `httpx` connection pool, so connections (and their TLS
+sessions) are reused across agents and the total number of outbound
+connections is bounded by `Settings.llm_http_max_connections`. Chat models
+also share one token-bucket rate limiter (`Settings.llm_requests_per_second`)
+so that all graph nodes together stay within the provider quota.
+"""
+
+import importlib.util
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import httpx
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.rate_limiters import InMemoryRateLimiter
 
 from ..config import get_settings
+from ..metrics import REGISTRY
+
+
+def _require_openai_key(api_key: str) -> None:
+    if not api_key:
+        raise ValueError(
+            "OPENAI_API_KEY is required when LLM_PROVIDER is 'openai'."
+        )
+
+
+def _http_options() -> dict:
+    settings = get_settings()
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.llm_http_max_connections,
+            max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+            keepalive_expiry=settings.llm_http_keepalive_expiry_seconds,
+        ),
+        # HTTP/2 needs the optional `h2` package.
+        "http2": settings.llm_http2 and importlib.util.find_spec("h2") is not None,
+    }
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """Shared sync HTTP client for all OpenAI calls."""
+    options = _http_options()
+    client = httpx.Client(transport=httpx.HTTPTransport(**options))
+    _register_pool_metrics()
+    return client
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client() -> httpx.AsyncClient:
+    """Shared async HTTP client for all OpenAI calls."""
+    options = _http_options()
+    client = httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(**options))
+    _register_pool_metrics()
+    return client
 
 
-def create_chat_model(temperature: float = 0.0) -> ChatOpenAI:
-    """Create a LangChain v1 ChatOpenAI instance.
+def _connection_counts(client: httpx.Client | httpx.AsyncClient) -> Dict[str, int]:
+    # httpx does not expose its pool publicly; read the httpcore pool of
+    # the transport created above and report zeros if that ever changes.
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {"active": len(connections) - idle, "idle": idle}
+
+
+def _created_clients() -> Dict[str, httpx.Client | httpx.AsyncClient]:
+    clients = {}
+    if get_http_client.cache_info().currsize:
+        clients["sync"] = get_http_client()
+    if get_async_http_client.cache_info().currsize:
+        clients["async"] = get_async_http_client()
+    return clients
+
+
+def http_pool_stats() -> Dict[str, object]:
+    """Active/idle connections of the shared pools that have been created.
+
+    Returns:
+        `{"max_connections": limit, "sync": {"active", "idle"}, "async": ...}`;
+        a pool appears only once its client was first used.
+    """
+    stats: Dict[str, object] = {"max_connections": get_settings().llm_http_max_connections}
+    for name, client in _created_clients().items():
+        stats[name] = _connection_counts(client)
+    return stats
+
+
+def _pool_samples() -> List[Tuple[str, Dict[str, str], float]]:
+    return [
+        ("ikms_llm_http_connections", {"client": name, "state": state}, value)
+        for name, client in _created_clients().items()
+        for state, value in _connection_counts(client).items()
+    ]
+
+
+def _register_pool_metrics() -> None:
+    REGISTRY.register_collector(
+        "ikms_llm_http_connections",
+        "Connections in the shared LLM HTTP pools by client and state.",
+        "gauge",
+        _pool_samples,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> InMemoryRateLimiter | None:
+    """Token bucket shared by every chat model, or `None` when disabled."""
+    settings = get_settings()
+    if settings.llm_requests_per_second <= 0:
+        return None
+    return InMemoryRateLimiter(
+        requests_per_second=settings.llm_requests_per_second,
+        check_every_n_seconds=0.05,
+        max_bucket_size=settings.llm_max_burst,
+    )
+
+
+def create_chat_model(temperature: float = 0.0) -> BaseChatModel:
+    """Create a LangChain v1 chat model for the configured provider.
 
     Args:
         temperature: Model temperature (default: 0.0 for deterministic outputs).
 
     Returns:
-        Configured ChatOpenAI instance.
+        Configured ChatOpenAI instance, or a `FakeChatModel` when
+        `Settings.llm_provider` is "fake".
     """
     settings = get_settings()
+    if settings.llm_provider == "fake":
+        from .fake import FakeChatModel
+
+        return FakeChatModel(
+            latency_seconds=settings.fake_llm_latency_ms / 1000,
+            rate_limiter=get_rate_limiter(),
+        )
+
+    from langchain_openai import ChatOpenAI
+
+    _require_openai_key(settings.openai_api_key)
     return ChatOpenAI(
         model=settings.openai_model_name,
         api_key=settings.openai_api_key,
         temperature=temperature,
+        # Report token usage on streamed responses too (for metrics).
+        stream_usage=True,
+        rate_limiter=get_rate_limiter(),
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+    )
+
+
+def create_embeddings() -> Embeddings:
+    """Create an embeddings client for the configured provider.
+
+    Returns:
+        Configured OpenAIEmbeddings instance, or deterministic
+        `HashEmbeddings` when `Settings.llm_provider` is "fake".
+    """
+    settings = get_settings()
+    if settings.llm_provider == "fake":
+        from .fake import HashEmbeddings
+
+        return HashEmbeddings(
+            dimensions=settings.fake_embedding_dimensions,
+            latency_seconds=settings.fake_embedding_latency_ms / 1000,
+        )
+
+    from langchain_openai import OpenAIEmbeddings
+
+    _require_openai_key(settings.openai_api_key)
+    return OpenAIEmbeddings(
+        model=settings.openai_embedding_model_name,
+        api_key=settings.openai_api_key,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
     )
@@ -0,0 +1,254 @@
+"""Deterministic offline chat and embedding models for load testing.
+
+Selected with `Settings.llm_provider = "fake"`. Both models answer without
+any network access after an optional, configurable delay, so the full
+LangGraph pipeline can be benchmarked and profiled in isolation from
+provider latency and quota:
+
+- `FakeChatModel` recognises the agent it is serving from the system
+  prompt and produces scripted output in the format each node expects
+  (a structured plan, or PLAN / SUB-QUESTIONS text, for planning, tool calls for the retrieval agent,
+  extractive answers for summarization and verification).
+- `HashEmbeddings` builds feature-hashed bag-of-words vectors, so texts that
+  share words land close together and retrieval results stay meaningful.
+"""
+
+import asyncio
+import json
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Iterator, List, Optional, Sequence
+
+import numpy as np
+import xxhash
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_SPLIT_RE = re.compile(r",|;| and | compared to | versus | vs\.? ", re.IGNORECASE)
+_CHUNK_HEADER_RE = re.compile(r"^Chunk \d+ \(page=[^)]*\):$")
+
+
+def _question_from(text: str) -> str:
+    match = re.search(r"(?:Question:|answer this question:)\s*(.+)", text)
+    return (match.group(1) if match else text).strip().splitlines()[0]
+
+
+def _sub_questions(question: str) -> List[str]:
+    parts = [part.strip(" ?.").lower() for part in _SPLIT_RE.split(question)]
+    return [part for part in parts if part][:5] or [question]
+
+
+def _extract_answer(context: str, max_sentences: int = 3) -> str:
+    lines = [
+        line.strip()
+        for line in context.splitlines()
+        if line.strip() and not _CHUNK_HEADER_RE.match(line.strip())
+    ]
+    sentences = re.split(r"(?<=[.!?])\s+", " ".join(lines))
+    return " ".join(sentences[:max_sentences]).strip()
+
+
+class FakeChatModel(BaseChatModel):
+    """Scripted chat model that mimics each agent of the QA pipeline."""
+
+    latency_seconds: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _respond(self, messages: List[BaseMessage], tools: Optional[list]) -> AIMessage:
+        system = next(
+            (str(m.content) for m in messages if isinstance(m, SystemMessage)), ""
+        )
+        last = messages[-1]
+        text = str(last.content)
+
+        if "Planning Agent" in system:
+            question = _question_from(text)
+            subs = _sub_questions(question)
+            plan = f"Search for each aspect of the question separately ({len(subs)} focused queries)."
+            if tools:
+                # Structured output: answer with a call of the schema tool.
+                args = {
+                    "plan": plan,
+                    "complexity": "complex" if len(subs) > 1 else "simple",
+                    "sub_questions": subs,
+                }
+                call = {"name": tools[0]["function"]["name"], "args": args, "id": uuid.uuid4().hex}
+                return self._with_usage(AIMessage(content="", tool_calls=[call]), messages)
+            content = (
+                f"PLAN: {plan}\n\nSUB-QUESTIONS:\n"
+                + "\n".join(f'{i}. "{sub}"' for i, sub in enumerate(subs, 1))
+            )
+        elif tools and not isinstance(last, ToolMessage):
+            focus = re.findall(r"^\d+\.\s+(.+)$", text, flags=re.MULTILINE)
+            queries = focus or [_question_from(text)]
+            tool_name = tools[0]["function"]["name"]
+            return self._with_usage(
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {"name": tool_name, "args": {"query": q}, "id": uuid.uuid4().hex}
+                        for q in queries
+                    ],
+                ),
+                messages,
+            )
+        elif isinstance(last, ToolMessage):
+            content = "CONTEXT gathered from the retrieval tool."
+        elif "Verification Agent" in system:
+            draft = text.split("Draft Answer:", 1)[-1]
+            content = draft.split("Please verify", 1)[0].strip()
+        elif "Context:" in text:
+            context = text.split("Context:", 1)[1]
+            content = _extract_answer(context) or "The document does not say."
+        else:
+            content = text
+        return self._with_usage(AIMessage(content=content), messages)
+
+    @staticmethod
+    def _with_usage(message: AIMessage, messages: List[BaseMessage]) -> AIMessage:
+        prompt_tokens = sum(len(str(m.content).split()) for m in messages)
+        completion_tokens = len(str(message.content).split())
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        return message
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        message = self._respond(messages, kwargs.get("tools"))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        message = self._respond(messages, kwargs.get("tools"))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunks(self, message: AIMessage) -> Iterator[ChatGenerationChunk]:
+        if message.tool_calls:
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": call["name"],
+                            "args": json.dumps(call["args"]),
+                            "id": call["id"],
+                            "index": index,
+                        }
+                        for index, call in enumerate(message.tool_calls)
+                    ],
+                    usage_metadata=message.usage_metadata,
+                )
+            )
+            return
+        words = re.split(r"(\s+)", str(message.content))
+        for index, word in enumerate(words):
+            if word:
+                yield ChatGenerationChunk(
+                    message=AIMessageChunk(
+                        content=word,
+                        usage_metadata=(
+                            message.usage_metadata if index == len(words) - 1 else None
+                        ),
+                    )
+                )
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        for chunk in self._chunks(self._respond(messages, kwargs.get("tools"))):
+            if run_manager is not None:
+                run_manager.on_llm_new_token(str(chunk.message.content), chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        for chunk in self._chunks(self._respond(messages, kwargs.get("tools"))):
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(str(chunk.message.content), chunk=chunk)
+            yield chunk
+
+
+class HashEmbeddings(Embeddings):
+    """Feature-hashed bag-of-words embeddings (deterministic, offline)."""
+
+    def __init__(self, dimensions: int = 1536, latency_seconds: float = 0.0) -> None:
+        self.dimensions = dimensions
+        self.latency_seconds = latency_seconds
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for word in _WORD_RE.findall(text.lower()):
+            digest = xxhash.xxh64_intdigest(word.encode())
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self.dimensions] += sign
+        norm = float(np.linalg.norm(vector))
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
@@ -0,0 +1,235 @@
+"""Lightweight, dependency-free metrics registry with Prometheus export.
+
+Provides labelled counters and histograms plus "collectors" (callables
+sampled at scrape time, e.g. cache statistics). `render_prometheus()`
+produces the Prometheus text exposition format served at `/metrics`.
+
+Recording is a dict lookup plus a few additions under a lock, so it is
+cheap enough to sit on the hot path of every node and model call.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonically increasing counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+        lines: List[str] = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics and scrape-time collectors."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help, labels, buckets))
+
+    def register_collector(
+        self, name: str, help: str, kind: str, collect: Callable[[], Iterable[Sample]]
+    ) -> None:
+        """Register a callable sampled at scrape time.
+
+        `collect` returns `(metric_name, labels, value)` samples; `kind` is
+        the Prometheus type ("gauge" or "counter") announced for `name`.
+        """
+        with self._lock:
+            self._collectors = [c for c in self._collectors if c[0] != name]
+            self._collectors.append((name, help, kind, collect))
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        for name, help, kind, collect in collectors:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in collect():
+                names = tuple(labels)
+                values = tuple(labels[n] for n in names)
+                lines.append(f"{sample_name}{_format_labels(names, values)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+NODE_LATENCY = REGISTRY.histogram(
+    "ikms_node_latency_seconds", "Latency of each QA graph node.", labels=("node",)
+)
+NODE_ERRORS = REGISTRY.counter(
+    "ikms_node_errors_total", "QA graph node invocations that raised.", labels=("node",)
+)
+LLM_LATENCY = REGISTRY.histogram(
+    "ikms_llm_latency_seconds", "Latency of LLM calls by graph node.", labels=("node",)
+)
+LLM_TOKENS = REGISTRY.counter(
+    "ikms_llm_tokens_total", "LLM tokens by graph node and kind.", labels=("node", "kind")
+)
+VECTOR_LATENCY = REGISTRY.histogram(
+    "ikms_vector_search_latency_seconds", "Latency of vector store operations.", labels=("operation",)
+)
+RETRIEVED_CHUNKS = REGISTRY.histogram(
+    "ikms_retrieved_chunks", "Chunks returned per retrieval stage.", labels=("stage",), buckets=SIZE_BUCKETS
+)
+CONTEXT_COMPRESSION = REGISTRY.histogram(
+    "ikms_context_compression_ratio",
+    "Context size after extractive compression as a fraction of the original.",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+CONTEXT_CHARS = REGISTRY.histogram(
+    "ikms_context_chars",
+    "Size of the context passed to answer generation, in characters.",
+    buckets=tuple(256 * 2**i for i in range(10)),
+)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+@contextmanager
+def timer(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the wall-clock duration of the enclosed block."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+def timed_node(name: str) -> Callable[[F], F]:
+    """Decorate an async graph node to record its latency and errors."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                NODE_ERRORS.inc(node=name)
+                raise
+            finally:
+                NODE_LATENCY.observe(time.perf_counter() - start, node=name)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
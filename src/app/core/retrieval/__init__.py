@@ -1,5 +1,23 @@
 """Retrieval module for vector store operations."""
 
-from .vector_store import get_retriever, retrieve
+from .vector_store import (
+    aretrieve_many,
+    get_bm25_index,
+    get_corpus_version,
+    get_document_embeddings,
+    get_embeddings,
+    get_retriever,
+    retrieve,
+    retrieve_many,
+)
 
-__all__ = ["get_retriever", "retrieve"]
+__all__ = [
+    "aretrieve_many",
+    "get_bm25_index",
+    "get_corpus_version",
+    "get_document_embeddings",
+    "get_embeddings",
+    "get_retriever",
+    "retrieve",
+    "retrieve_many",
+]
@@ -0,0 +1,233 @@
+"""Local BM25 inverted index for lexical retrieval.
+
+Built alongside the vector index at ingest time so that exact terms such as
+algorithm names and acronyms ("HNSW", "IVF-PQ") are found even when dense
+embeddings miss them. The index is persisted as gzip-compressed JSON
+segments: each `add_documents` or `delete` call appends one segment
+(incremental updates). Segments hold `{"id", "text", "metadata"}` records
+and `{"delete": [...]}` tombstones and are replayed in order at start-up;
+a record whose id is already indexed replaces the earlier one (upsert).
+
+Once there are too many segments, the ones written since the last full
+rewrite are merged into one. The full rewrite into
+`segment-000000.json.gz`, which also drops deleted rows and tombstones,
+runs only when those newer records outnumber the base segment's, so its
+cost is amortized over the records added since the previous one.
+"""
+
+import gzip
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-_][a-z0-9]+)*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does",
+    "for", "from", "how", "in", "is", "it", "of", "on", "or", "that", "the",
+    "this", "to", "was", "what", "when", "which", "why", "with",
+}
+_MAX_SEGMENTS = 16
+_BASE_SEGMENT = "segment-000000.json.gz"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens without stopwords (hyphenated terms kept whole)."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class BM25Index:
+    """In-memory BM25 (Okapi) index with segment-based persistence."""
+
+    def __init__(self, path: Path, k1: float = 1.5, b: float = 0.75) -> None:
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._texts: List[str] = []
+        self._metadatas: List[dict] = []
+        self._ids: List[str | None] = []
+        self._lengths: List[int] = []
+        self._alive: List[bool] = []
+        self._row_by_id: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._live = 0
+        self._total_length = 0
+        self._base_records = 0
+        self._load()
+
+    def __len__(self) -> int:
+        return self._live
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.path.glob("segment-*.json.gz"))
+
+    @staticmethod
+    def _read_segment(segment: Path) -> List[dict]:
+        with gzip.open(segment, "rt", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        for segment in self._segments():
+            records = self._read_segment(segment)
+            if segment.name == _BASE_SEGMENT:
+                self._base_records = len(records)
+            self._add_records(records)
+
+    def _write_segment(self, name: str, records: List[dict]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        target = self.path / name
+        partial = target.with_suffix(".tmp")
+        with gzip.open(partial, "wt", encoding="utf-8") as handle:
+            json.dump(records, handle, separators=(",", ":"))
+        os.replace(partial, target)
+
+    def _append_segment(self, records: List[dict]) -> None:
+        segments = self._segments()
+        last = int(segments[-1].name.split("-")[1].split(".")[0]) if segments else 0
+        self._write_segment(f"segment-{last + 1:06d}.json.gz", records)
+        if len(segments) + 1 > _MAX_SEGMENTS:
+            self._merge()
+
+    def _merge(self) -> None:
+        """Merge the segments written since the last full rewrite."""
+        segments = self._segments()
+        tail = [segment for segment in segments if segment.name != _BASE_SEGMENT]
+        records = [record for segment in tail for record in self._read_segment(segment)]
+        if len(records) >= self._base_records:
+            self._compact()
+            return
+        # The merged segment takes the newest name, so replay order is kept.
+        self._write_segment(tail[-1].name, records)
+        for segment in tail[:-1]:
+            segment.unlink()
+
+    def _compact(self) -> None:
+        """Rewrite the live rows as the base segment and drop all others."""
+        segments = self._segments()
+        records = [
+            {"id": doc_id, "text": text, "metadata": metadata}
+            for doc_id, text, metadata, alive in zip(
+                self._ids, self._texts, self._metadatas, self._alive
+            )
+            if alive
+        ]
+        self._write_segment(_BASE_SEGMENT, records)
+        self._base_records = len(records)
+        for segment in segments:
+            if segment.name != _BASE_SEGMENT:
+                segment.unlink()
+
+    # ------------------------------------------------------------------
+    # Indexing and search
+    # ------------------------------------------------------------------
+
+    def _remove_row(self, row: int) -> None:
+        for term in set(tokenize(self._texts[row])):
+            postings = self._postings[term]
+            postings.pop(row, None)
+            if not postings:
+                del self._postings[term]
+        self._alive[row] = False
+        self._live -= 1
+        self._total_length -= self._lengths[row]
+
+    def _add_records(self, records: List[dict]) -> None:
+        for record in records:
+            if "delete" in record:
+                for doc_id in record["delete"]:
+                    row = self._row_by_id.pop(doc_id, None)
+                    if row is not None:
+                        self._remove_row(row)
+                continue
+
+            doc_id = record.get("id")
+            if doc_id is not None and doc_id in self._row_by_id:
+                self._remove_row(self._row_by_id[doc_id])
+            row = len(self._texts)
+            tokens = tokenize(record["text"])
+            self._texts.append(record["text"])
+            self._metadatas.append(record.get("metadata") or {})
+            self._ids.append(doc_id)
+            self._lengths.append(len(tokens))
+            self._alive.append(True)
+            self._live += 1
+            self._total_length += len(tokens)
+            if doc_id is not None:
+                self._row_by_id[doc_id] = row
+            for term, count in Counter(tokens).items():
+                self._postings[term][row] = count
+
+    def add_documents(self, docs: Sequence[Document], ids: Sequence[str] | None = None) -> None:
+        """Index documents and persist them as a new segment.
+
+        Documents whose id is already indexed replace the earlier version.
+        """
+        if not docs:
+            return
+        ids = list(ids) if ids is not None else [doc.id for doc in docs]
+        records = [
+            {"id": doc_id, "text": doc.page_content, "metadata": doc.metadata}
+            for doc, doc_id in zip(docs, ids)
+        ]
+        with self._lock:
+            self._add_records(records)
+            self._append_segment(records)
+
+    def delete(self, ids: Sequence[str]) -> bool:
+        """Remove documents by id and persist a tombstone segment.
+
+        Returns:
+            Whether any of the ids was indexed.
+        """
+        with self._lock:
+            present = [doc_id for doc_id in ids if doc_id in self._row_by_id]
+            if not present:
+                return False
+            records = [{"delete": present}]
+            self._add_records(records)
+            self._append_segment(records)
+        return True
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        """Return the top-`k` documents by BM25 score."""
+        terms = set(tokenize(query))
+        with self._lock:
+            total = self._live
+            if not total or not terms:
+                return []
+            avg_length = self._total_length / total
+            scores: Dict[int, float] = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for row, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[row] / avg_length)
+                    scores[row] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+            top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [
+                (
+                    Document(
+                        id=self._ids[row],
+                        page_content=self._texts[row],
+                        metadata=dict(self._metadatas[row]),
+                    ),
+                    score,
+                )
+                for row, score in top
+            ]
@@ -0,0 +1,125 @@
+"""Extractive context compression: keep only the sentences that matter.
+
+Retrieved chunks are passed verbatim into the answer-generation prompts, and
+with several sub-questions most of that text is unrelated to what is being
+asked. `compress_documents` scores every sentence of every chunk against the
+question and sub-questions with TF-IDF cosine similarity (vectorized in
+NumPy, no LLM call) and keeps the best sentences of each chunk in their
+original order. Chunk metadata, including the page reference, is preserved.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+
+from ..config import get_settings
+from .bm25 import tokenize
+from .context import DocumentKeys
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+
+
+@dataclass
+class CompressionStats:
+    """Characters before and after compression for one request."""
+
+    original_chars: int = 0
+    compressed_chars: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """Compressed size as a fraction of the original (1.0 = unchanged)."""
+        if not self.original_chars:
+            return 1.0
+        return self.compressed_chars / self.original_chars
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split chunk text into sentences (chunk boundaries may cut the first/last)."""
+    return [sentence.strip() for sentence in _SENTENCE_RE.split(text) if sentence.strip()]
+
+
+def _tfidf(rows: List[List[str]], document_rows: int) -> np.ndarray:
+    """L2-normalized TF-IDF matrix; IDF is computed over the first `document_rows`."""
+    vocabulary: Dict[str, int] = {}
+    for tokens in rows:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+
+    matrix = np.zeros((len(rows), max(len(vocabulary), 1)), dtype=np.float32)
+    for row, tokens in enumerate(rows):
+        for token in tokens:
+            matrix[row, vocabulary[token]] += 1.0
+    np.log1p(matrix, out=matrix)
+
+    df = np.count_nonzero(matrix[:document_rows], axis=0)
+    matrix *= (np.log((1 + document_rows) / (1 + df)) + 1).astype(np.float32)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def compress_documents(
+    results: Sequence[Sequence[Document]],
+    queries: Sequence[str],
+    max_sentences: int | None = None,
+) -> tuple[List[List[Document]], CompressionStats]:
+    """Reduce every chunk to its sentences most similar to the queries.
+
+    A sentence's relevance is its best cosine similarity to any query. Each
+    chunk keeps at most `max_sentences` sentences, dropping those that share
+    no term with any query unless nothing else is left. Duplicate chunks
+    (same id or same content) across result lists are compressed once.
+
+    Args:
+        results: One list of documents per query / tool call.
+        queries: The question and its sub-questions.
+        max_sentences: Sentences kept per chunk (defaults to
+            `Settings.context_compression_sentences`).
+
+    Returns:
+        `(results, stats)` where `results` has the same shape as the input
+        with compressed copies of the documents.
+    """
+    if max_sentences is None:
+        max_sentences = get_settings().context_compression_sentences
+
+    doc_key = DocumentKeys()
+    keyed = [[doc_key(doc) for doc in result] for result in results]
+    chunks: Dict[str, Document] = {}
+    for result, result_keys in zip(results, keyed):
+        for doc, key in zip(result, result_keys):
+            chunks.setdefault(key, doc)
+    stats = CompressionStats()
+    if not chunks:
+        return [list(result) for result in results], stats
+
+    keys = list(chunks)
+    sentences = [split_sentences(chunks[key].page_content) for key in keys]
+    flat = [sentence for chunk in sentences for sentence in chunk]
+    matrix = _tfidf([tokenize(text) for text in [*flat, *queries]], len(flat))
+    scores = (matrix[: len(flat)] @ matrix[len(flat) :].T).max(axis=1, initial=0.0)
+
+    compressed: Dict[str, Document] = {}
+    offset = 0
+    for key, chunk_sentences in zip(keys, sentences):
+        doc = chunks[key]
+        chunk_scores = scores[offset : offset + len(chunk_sentences)]
+        offset += len(chunk_sentences)
+
+        if chunk_sentences:
+            ranked = [i for i in np.argsort(-chunk_scores, kind="stable") if chunk_scores[i] > 0]
+            keep = sorted(ranked[:max_sentences]) or [int(np.argmax(chunk_scores))]
+            content = " ".join(chunk_sentences[i] for i in keep)
+        else:
+            content = doc.page_content
+
+        stats.original_chars += len(doc.page_content)
+        stats.compressed_chars += len(content)
+        compressed[key] = Document(id=doc.id, page_content=content, metadata=dict(doc.metadata))
+
+    return [[compressed[key] for key in result_keys] for result_keys in keyed], stats
@@ -0,0 +1,136 @@
+"""Context assembly: merge, deduplicate and token-budget retrieved chunks.
+
+Retrieval can return the same chunk for several (sub-)queries and more text
+than the answer-generation prompts need. `assemble_context` merges every
+result list, drops duplicates by id / content hash, orders the survivors by
+relevance with an MMR-style penalty for redundancy, and keeps chunks only
+while they fit in the configured token budget.
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Set
+
+import xxhash
+from langchain_core.documents import Document
+
+from ..config import get_settings
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Approximate per-chunk overhead of the "Chunk N (page=X):" header.
+_HEADER_TOKENS = 8
+
+
+@lru_cache(maxsize=1)
+def _token_counter() -> Callable[[str], int]:
+    """Token counter for the configured chat model (tiktoken when available).
+
+    Falls back to a ~4 characters/token estimate when tiktoken or its
+    encoding files are unavailable (e.g. offline runs).
+    """
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(get_settings().openai_model_name)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return lambda text: (len(text) + 3) // 4
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in `text` as the configured chat model would."""
+    return _token_counter()(text)
+
+
+class DocumentKeys:
+    """Deduplication keys: documents sharing an id *or* content share a key.
+
+    Ids alone are not enough, since the same chunk indexed twice under
+    different ids would otherwise be kept twice.
+    """
+
+    def __init__(self) -> None:
+        self._by_id: Dict[str, str] = {}
+
+    def __call__(self, doc: Document) -> str:
+        key = xxhash.xxh3_64_hexdigest(doc.page_content.strip().encode())
+        if doc.id:
+            key = self._by_id.setdefault(doc.id, key)
+        return key
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def assemble_context(
+    results: Sequence[Sequence[Document]],
+    token_budget: int | None = None,
+    mmr_lambda: float | None = None,
+) -> List[Document]:
+    """Merge several retrieval results into one deduplicated, budgeted list.
+
+    Relevance is the similarity `score` in metadata when present, otherwise
+    `1 / (rank + 1)` within its result list; duplicates keep their best
+    relevance. Chunks are then picked greedily by
+    `mmr_lambda * relevance - (1 - mmr_lambda) * max_overlap`, where overlap
+    is the word-set Jaccard similarity to chunks already picked, skipping
+    any chunk that would exceed the token budget.
+
+    Args:
+        results: One list of documents per query / tool call.
+        token_budget: Maximum context tokens (defaults to
+            `Settings.context_token_budget`).
+        mmr_lambda: Relevance/diversity trade-off in [0, 1] (defaults to
+            `Settings.context_mmr_lambda`; 1 disables the diversity penalty).
+
+    Returns:
+        The selected documents in selection order.
+    """
+    settings = get_settings()
+    if token_budget is None:
+        token_budget = settings.context_token_budget
+    if mmr_lambda is None:
+        mmr_lambda = settings.context_mmr_lambda
+
+    doc_key = DocumentKeys()
+    docs: Dict[str, Document] = {}
+    relevance: Dict[str, float] = {}
+    for result in results:
+        for rank, doc in enumerate(result):
+            key = doc_key(doc)
+            score = float(doc.metadata.get("score", 1.0 / (rank + 1)))
+            if key not in docs or score > relevance[key]:
+                docs[key] = doc
+                relevance[key] = score
+    if not docs:
+        return []
+
+    top = max(relevance.values())
+    low = min(relevance.values())
+    spread = (top - low) or 1.0
+    normalized = {key: (value - low) / spread for key, value in relevance.items()}
+    words = {key: set(_WORD_RE.findall(doc.page_content.lower())) for key, doc in docs.items()}
+
+    selected: List[str] = []
+    remaining = set(docs)
+    used = 0
+    while remaining:
+        def mmr(key: str) -> float:
+            overlap = max((_jaccard(words[key], words[s]) for s in selected), default=0.0)
+            return mmr_lambda * normalized[key] - (1 - mmr_lambda) * overlap
+
+        best = max(remaining, key=lambda key: (mmr(key), relevance[key]))
+        remaining.discard(best)
+        cost = count_tokens(docs[best].page_content) + _HEADER_TOKENS
+        if used + cost > token_budget:
+            continue
+        selected.append(best)
+        used += cost
+
+    return [docs[key] for key in selected]
@@ -0,0 +1,184 @@
+"""Content-addressed, on-disk cache for document embeddings.
+
+Chunks are keyed by an xxhash of (embedding model name, chunk text), so
+re-uploading a corrected PDF, or the same PDF under a new name, only pays
+for the chunks whose text actually changed. Vectors are stored as float32
+blobs in a single SQLite file and evicted least-recently-used once the
+configured entry limit is exceeded.
+
+Only indexing goes through the cache (see `get_document_embeddings`): query
+vectors are one-off and would just push chunk vectors out of the LRU.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List
+
+import numpy as np
+import xxhash
+from langchain_core.embeddings import Embeddings
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Counters for chunks served from / added to the embedding cache."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+_run_stats: ContextVar[EmbeddingCacheStats | None] = ContextVar(
+    "embedding_cache_run_stats", default=None
+)
+
+
+@contextmanager
+def track_embedding_cache() -> Iterator[EmbeddingCacheStats]:
+    """Collect cache statistics for the embedding calls made in this context.
+
+    Example:
+        with track_embedding_cache() as stats:
+            vector_store.add_documents(chunks)
+        print(stats.hits, stats.misses)
+    """
+    stats = EmbeddingCacheStats()
+    token = _run_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _run_stats.reset(token)
+
+
+class CachedEmbeddings(Embeddings):
+    """`Embeddings` wrapper that persists document vectors on disk.
+
+    Only `embed_documents` is cached; `embed_query` is delegated directly
+    since query vectors are rarely reused verbatim. The async methods run
+    the SQLite work in a worker thread so they never block the event loop.
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        model_name: str,
+        path: Path,
+        max_entries: int,
+    ) -> None:
+        self.underlying = underlying
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.stats = EmbeddingCacheStats()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+        # Row count kept up to date by `_store`, so writes never scan the table.
+        (self._count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+
+    def _key(self, text: str) -> str:
+        return xxhash.xxh3_128_hexdigest(f"{self.model_name}\0{text}".encode())
+
+    def _lookup(self, keys: List[str]) -> dict[str, List[float]]:
+        found: dict[str, List[float]] = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+                self._conn.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE key IN ({placeholders})",
+                    [now, *batch],
+                )
+            self._conn.commit()
+        return found
+
+    def _store(self, items: dict[str, List[float]]) -> None:
+        now = time.time()
+        with self._lock:
+            # Keys are content hashes, so a row inserted concurrently by
+            # another caller already holds the same vector.
+            inserted = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [
+                    (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for key, vector in items.items()
+                ],
+            ).rowcount
+            self._count += inserted
+            if self._count > self.max_entries:
+                deleted = self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    " SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (self._count - self.max_entries,),
+                ).rowcount
+                self._count -= deleted
+            self._conn.commit()
+
+    def _record(self, hits: int, misses: int) -> None:
+        for stats in (self.stats, _run_stats.get()):
+            if stats is not None:
+                stats.hits += hits
+                stats.misses += misses
+
+    def _split(self, texts: List[str]) -> tuple[List[str], dict[str, List[float]], List[str]]:
+        keys = [self._key(text) for text in texts]
+        cached = self._lookup(list(dict.fromkeys(keys)))
+        missing = list(
+            dict.fromkeys(text for text, key in zip(texts, keys) if key not in cached)
+        )
+        return keys, cached, missing
+
+    def _merge(
+        self,
+        texts: List[str],
+        keys: List[str],
+        cached: dict[str, List[float]],
+        missing: List[str],
+        computed: List[List[float]],
+    ) -> List[List[float]]:
+        fresh = {self._key(text): vector for text, vector in zip(missing, computed)}
+        if fresh:
+            self._store(fresh)
+        self._record(hits=len(texts) - len(missing), misses=len(missing))
+        return [cached.get(key) or fresh[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._split(texts)
+        computed = self.underlying.embed_documents(missing) if missing else []
+        return self._merge(texts, keys, cached, missing, computed)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = await asyncio.to_thread(self._split, texts)
+        computed = await self.underlying.aembed_documents(missing) if missing else []
+        return await asyncio.to_thread(self._merge, texts, keys, cached, missing, computed)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.underlying.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.underlying.aembed_query(text)
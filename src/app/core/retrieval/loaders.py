@@ -0,0 +1,177 @@
+"""PDF loading backends for the indexing pipeline.
+
+Two interchangeable backends produce LangChain `Document` objects, one per
+page, with the same `source` / `page` / `total_pages` metadata that
+`PyPDFLoader` emits (and that `serialize_chunks` relies on):
+
+- "pypdf": LangChain's `PyPDFLoader` (pure Python, single-threaded)
+- "pymupdf": PyMuPDF text extraction; large documents are split into page
+  ranges that are extracted in parallel across a long-lived process pool
+  whose workers are spawned, never forked (the API process runs threads)
+
+Backend libraries are imported on first use so that importing the API does
+not pay for them.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from langchain_core.documents import Document
+
+from ..config import get_settings
+
+PageCallback = Callable[[int], None]
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages `[start, stop)`; runs in a worker process."""
+    import pymupdf
+
+    with pymupdf.open(path) as pdf:
+        return [pdf[number].get_text() for number in range(start, stop)]
+
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Get the shared extraction pool with `workers` processes.
+
+    Workers use the "spawn" start method: forking a process that already
+    runs threads (event loop, SQLite, HTTP pools) can deadlock the child.
+    The pool is reused across documents, so workers start only once.
+    """
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _pools[workers] = pool
+        return pool
+
+
+def _discard_process_pool(workers: int, pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next document starts a fresh one."""
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _page_documents(path: str, start: int, texts: List[str], total: int) -> List[Document]:
+    return [
+        Document(
+            page_content=text,
+            metadata={"source": path, "page": start + offset, "total_pages": total},
+        )
+        for offset, text in enumerate(texts)
+    ]
+
+
+def load_pdf_pypdf(path: Path, on_page: PageCallback | None = None) -> List[Document]:
+    """Load a PDF page by page with `PyPDFLoader`."""
+    from langchain_community.document_loaders import PyPDFLoader
+
+    docs: List[Document] = []
+    for page in PyPDFLoader(str(path)).lazy_load():
+        docs.append(page)
+        if on_page is not None:
+            on_page(len(docs))
+    return docs
+
+
+def load_pdf_pymupdf(
+    path: Path,
+    on_page: PageCallback | None = None,
+    workers: int | None = None,
+    parallel_min_pages: int | None = None,
+) -> List[Document]:
+    """Load a PDF with PyMuPDF, extracting page ranges in parallel.
+
+    Args:
+        path: Path to the PDF on disk.
+        on_page: Optional callback receiving the number of pages extracted so far.
+        workers: Worker processes (defaults to `Settings.pdf_loader_workers`).
+        parallel_min_pages: Page count below which extraction stays in-process
+            (defaults to `Settings.pdf_parallel_min_pages`).
+
+    Returns:
+        One Document per page, ordered by page number.
+    """
+    import pymupdf
+
+    settings = get_settings()
+    workers = workers or settings.pdf_loader_workers
+    if parallel_min_pages is None:
+        parallel_min_pages = settings.pdf_parallel_min_pages
+
+    source = str(path)
+    with pymupdf.open(source) as pdf:
+        total = pdf.page_count
+
+    if workers <= 1 or total < parallel_min_pages:
+        texts = _extract_page_range(source, 0, total)
+        if on_page is not None:
+            on_page(total)
+        return _page_documents(source, 0, texts, total)
+
+    # Several ranges per worker keeps progress reporting smooth and evens
+    # out pages that are much more expensive to extract than others.
+    range_size = max(1, -(-total // (workers * 4)))
+    ranges = [(start, min(start + range_size, total)) for start in range(0, total, range_size)]
+    pages: List[List[Document]] = [[] for _ in ranges]
+    done = 0
+
+    pool = _get_process_pool(workers)
+    futures = {}
+    try:
+        for index, (start, stop) in enumerate(ranges):
+            futures[pool.submit(_extract_page_range, source, start, stop)] = index
+        for future in as_completed(futures):
+            index = futures[future]
+            start = ranges[index][0]
+            pages[index] = _page_documents(source, start, future.result(), total)
+            done += len(pages[index])
+            if on_page is not None:
+                on_page(done)
+    except BrokenProcessPool:
+        _discard_process_pool(workers, pool)
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+    return [doc for chunk in pages for doc in chunk]
+
+
+LOADERS = {
+    "pypdf": load_pdf_pypdf,
+    "pymupdf": load_pdf_pymupdf,
+}
+
+
+def load_pdf(
+    path: Path, on_page: PageCallback | None = None, backend: str | None = None
+) -> List[Document]:
+    """Load a PDF with the configured backend (`Settings.pdf_loader_backend`).
+
+    Args:
+        path: Path to the PDF on disk.
+        on_page: Optional callback receiving the number of pages loaded so far.
+        backend: Override the configured backend ("pypdf" or "pymupdf").
+
+    Returns:
+        One Document per page with `source`, `page` and `total_pages` metadata.
+    """
+    backend = backend or get_settings().pdf_loader_backend
+    try:
+        loader = LOADERS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown PDF loader backend: {backend!r}") from None
+    return loader(path, on_page=on_page)
@@ -0,0 +1,301 @@
+"""Local, NumPy-backed vector store with memory-mapped persistence.
+
+An offline alternative to Pinecone (`Settings.vector_store_backend =
+"local"`) for CI, air-gapped machines and latency-sensitive deployments.
+On-disk layout under the store directory:
+
+- `header.json`: embedding dimension
+- `vectors.f32`: L2-normalized float32 matrix, one row per record, opened
+  with `np.memmap`, so start-up neither reads nor rebuilds the vectors
+- `records.jsonl`: append-only metadata sidecar; one `{"id", "text",
+  "metadata"}` line per row, plus `{"delete": [...]}` tombstone lines.
+  It is replayed in file order at start-up (texts and metadata are kept in
+  memory), so opening the store is linear in the number of records
+
+Search is a single matrix-vector product over the live rows followed by an
+`argpartition` top-k, i.e. exact cosine similarity. `delete` notifies the
+optional `on_delete` callback so that indexes kept alongside the store
+(e.g. the BM25 index) can drop the same chunks.
+"""
+
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+_INITIAL_CAPACITY = 1024
+
+
+class LocalVectorStore(VectorStore):
+    """Exact cosine-similarity vector store persisted as a memory-mapped matrix."""
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        path: Path,
+        on_delete: Optional[Callable[[List[str]], None]] = None,
+    ) -> None:
+        self._embedding = embedding
+        self.path = path
+        self._on_delete = on_delete
+        self._lock = threading.RLock()
+        self._dim: Optional[int] = None
+        self._vectors: Optional[np.memmap] = None
+        self._ids: List[Optional[str]] = []
+        self._texts: List[str] = []
+        self._metadatas: List[dict] = []
+        self._row_by_id: dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @property
+    def _header_path(self) -> Path:
+        return self.path / "header.json"
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.path / "vectors.f32"
+
+    @property
+    def _records_path(self) -> Path:
+        return self.path / "records.jsonl"
+
+    def _load(self) -> None:
+        if not self._header_path.exists():
+            return
+        self._dim = json.loads(self._header_path.read_text())["dim"]
+
+        # Tombstones apply only to the rows written before them: an upsert
+        # is a delete followed by a new row under the same id.
+        alive: List[bool] = []
+        if self._records_path.exists():
+            with self._records_path.open(encoding="utf-8") as records:
+                for line in records:
+                    record = json.loads(line)
+                    if "delete" in record:
+                        for doc_id in record["delete"]:
+                            row = self._row_by_id.pop(doc_id, None)
+                            if row is not None:
+                                alive[row] = False
+                                self._ids[row] = None
+                        continue
+                    previous = self._row_by_id.get(record["id"])
+                    if previous is not None:
+                        alive[previous] = False
+                        self._ids[previous] = None
+                    self._row_by_id[record["id"]] = len(self._ids)
+                    self._ids.append(record["id"])
+                    self._texts.append(record["text"])
+                    self._metadatas.append(record["metadata"])
+                    alive.append(True)
+
+        self._alive = np.array(alive, dtype=bool)
+        self._open_vectors()
+
+    def _open_vectors(self) -> None:
+        assert self._dim is not None
+        row_bytes = self._dim * np.dtype(np.float32).itemsize
+        capacity = self._vectors_path.stat().st_size // row_bytes
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self._dim)
+        )
+
+    def _ensure_capacity(self, rows: int, dim: int) -> None:
+        if self._dim is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._dim = dim
+            self._header_path.write_text(json.dumps({"dim": dim}))
+            self._vectors_path.touch()
+        elif dim != self._dim:
+            raise ValueError(f"Expected {self._dim}-dimensional embeddings, got {dim}.")
+
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(_INITIAL_CAPACITY, capacity)
+        while new_capacity < rows:
+            new_capacity *= 2
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with self._vectors_path.open("r+b") as handle:
+            handle.truncate(new_capacity * self._dim * np.dtype(np.float32).itemsize)
+        self._open_vectors()
+
+    def _append_records(self, records: Iterable[dict]) -> None:
+        with self._records_path.open("a", encoding="utf-8") as handle:
+            for record in records:
+                handle.write(json.dumps(record) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    # ------------------------------------------------------------------
+    # VectorStore API
+    # ------------------------------------------------------------------
+
+    def add_embeddings(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[dict]] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        """Add texts with precomputed embeddings; returns their ids."""
+        if not texts:
+            return []
+        metadatas = list(metadatas) if metadatas is not None else [{} for _ in texts]
+        ids = list(ids) if ids is not None else [uuid.uuid4().hex for _ in texts]
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            replaced = [doc_id for doc_id in ids if doc_id in self._row_by_id]
+            if replaced:
+                self._tombstone(replaced)
+
+            start = len(self._ids)
+            self._ensure_capacity(start + len(texts), matrix.shape[1])
+            self._vectors[start : start + len(texts)] = matrix
+            self._vectors.flush()
+            self._append_records(
+                {"id": doc_id, "text": text, "metadata": metadata}
+                for doc_id, text, metadata in zip(ids, texts, metadatas)
+            )
+
+            for offset, doc_id in enumerate(ids):
+                self._row_by_id[doc_id] = start + offset
+            self._ids.extend(ids)
+            self._texts.extend(texts)
+            self._metadatas.extend(metadatas)
+            self._alive = np.concatenate([self._alive, np.ones(len(texts), dtype=bool)])
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        embeddings = self._embedding.embed_documents(texts)
+        return self.add_embeddings(texts, embeddings, metadatas=metadatas, ids=ids)
+
+    def _tombstone(self, ids: List[str]) -> List[str]:
+        """Mark `ids` deleted on disk and in memory; returns those that existed."""
+        with self._lock:
+            present = [doc_id for doc_id in ids if doc_id in self._row_by_id]
+            if not present:
+                return []
+            rows = [self._row_by_id.pop(doc_id) for doc_id in present]
+            self._alive[rows] = False
+            for row in rows:
+                self._ids[row] = None
+            self._append_records([{"delete": present}])
+        return present
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            return False
+        deleted = self._tombstone(list(ids))
+        if not deleted:
+            return False
+        if self._on_delete is not None:
+            self._on_delete(deleted)
+        return True
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        with self._lock:
+            return [
+                self._document(self._row_by_id[doc_id])
+                for doc_id in ids
+                if doc_id in self._row_by_id
+            ]
+
+    def _document(self, row: int) -> Document:
+        return Document(
+            id=self._ids[row],
+            page_content=self._texts[row],
+            metadata=dict(self._metadatas[row]),
+        )
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: Sequence[float], k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        """Return the `k` most similar live documents with cosine scores."""
+        with self._lock:
+            count = len(self._ids)
+            if self._vectors is None or count == 0:
+                return []
+            query = np.asarray(embedding, dtype=np.float32)
+            norm = float(np.linalg.norm(query))
+            if norm:
+                query = query / norm
+
+            scores = np.asarray(self._vectors[:count] @ query)
+            scores[~self._alive] = -np.inf
+            k = min(k, int(self._alive.sum()))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self._document(int(row)), float(scores[row])) for row in top]
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: Sequence[float], k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        # Same signature as PineconeVectorStore's method of this name.
+        return self.similarity_search_with_score_by_vector(embedding, k)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(
+            self._embedding.embed_query(query), k
+        )
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        return lambda score: score
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        path: Optional[Path] = None,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        if path is None:
+            raise ValueError("LocalVectorStore.from_texts requires a `path`.")
+        store = cls(embedding=embedding, path=path)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
@@ -1,36 +1,146 @@
-"""Vector store wrapper for Pinecone integration with LangChain."""
+"""Vector store wrapper for Pinecone integration with LangChain.
 
+The backing store is selected by `Settings.vector_store_backend`: Pinecone
+(default) or the local memory-mapped `LocalVectorStore`. With
+`Settings.hybrid_retrieval_enabled`, every search also queries the local
+BM25 index in parallel and the two rankings are merged with reciprocal rank
+fusion.
+
+Clients and indexes are created on first use; the Pinecone SDK is imported
+only when that backend is selected.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from functools import lru_cache
-from typing import List
+from typing import Callable, Dict, List, Sequence, Tuple
 
-from pinecone import Pinecone
+import xxhash
 from langchain_core.documents import Document
-from langchain_pinecone import PineconeVectorStore
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
 
 from ..config import get_settings
+from ..llm.factory import create_embeddings
+from ..metrics import REGISTRY, VECTOR_LATENCY, timer
+from .bm25 import BM25Index
+from .embedding_cache import CachedEmbeddings
+from .local_store import LocalVectorStore
+
+# Incremented whenever the indexed corpus changes so that caches derived
+# from retrieval results (e.g. the answer cache) can invalidate themselves.
+_corpus_version = 0
+
+
+def get_corpus_version() -> int:
+    """Return a counter that changes every time documents are indexed or deleted."""
+    return _corpus_version
+
+
+@lru_cache(maxsize=1)
+def get_embeddings() -> Embeddings:
+    """Create the embeddings client configured from settings.
+
+    Used for queries (and query batches); indexing goes through
+    `get_document_embeddings`.
+    """
+    return create_embeddings()
+
 
 @lru_cache(maxsize=1)
-def _get_vector_store() -> PineconeVectorStore:
-    """Create a PineconeVectorStore instance configured from settings."""
+def get_document_embeddings() -> Embeddings:
+    """Get the embeddings used to index document chunks.
+
+    When `Settings.embedding_cache_enabled` is set, chunk vectors are
+    served from the on-disk `CachedEmbeddings` store where possible;
+    otherwise this is the plain `get_embeddings` client.
+    """
     settings = get_settings()
+    embeddings = get_embeddings()
+    if not settings.embedding_cache_enabled:
+        return embeddings
 
-    pc = Pinecone(api_key=settings.pinecone_api_key)
-    index = pc.Index(settings.pinecone_index_name)
+    model_name = settings.openai_embedding_model_name
+    if settings.llm_provider == "fake":
+        model_name = f"fake-hash-{settings.fake_embedding_dimensions}"
 
-    embeddings = OpenAIEmbeddings(
-        model=settings.openai_embedding_model_name,
-        api_key=settings.openai_api_key,
+    cached = CachedEmbeddings(
+        underlying=embeddings,
+        model_name=model_name,
+        path=Path(settings.embedding_cache_path),
+        max_entries=settings.embedding_cache_max_entries,
+    )
+    REGISTRY.register_collector(
+        "ikms_embedding_cache_lookups_total",
+        "Document embedding cache lookups by result.",
+        "counter",
+        lambda: [
+            ("ikms_embedding_cache_lookups_total", {"result": "hit"}, cached.stats.hits),
+            ("ikms_embedding_cache_lookups_total", {"result": "miss"}, cached.stats.misses),
+        ],
     )
+    return cached
+
+
+def _on_documents_deleted(ids: List[str]) -> None:
+    """Drop chunks deleted from the vector store from the BM25 index too.
+
+    Also bumps the corpus version, as `index_documents` does, so that
+    answers built from the deleted chunks are no longer served from cache.
+    """
+    index = get_bm25_index()
+    if index is not None:
+        index.delete(ids)
+
+    global _corpus_version
+    _corpus_version += 1
+
+
+@lru_cache(maxsize=1)
+def _get_vector_store() -> VectorStore:
+    """Create the vector store selected by `Settings.vector_store_backend`.
+
+    The store embeds chunks with `get_document_embeddings` when
+    `index_documents` adds them; its query searches call `embed_query`,
+    which the embedding cache passes straight through.
+    """
+    settings = get_settings()
+
+    if settings.vector_store_backend == "local":
+        return LocalVectorStore(
+            embedding=get_document_embeddings(),
+            path=Path(settings.local_vector_store_path),
+            on_delete=_on_documents_deleted,
+        )
+
+    if not (settings.pinecone_api_key and settings.pinecone_index_name):
+        raise ValueError(
+            "PINECONE_API_KEY and PINECONE_INDEX_NAME are required when "
+            "VECTOR_STORE_BACKEND is 'pinecone'."
+        )
+
+    from langchain_pinecone import PineconeVectorStore
+    from pinecone import Pinecone
+
+    pc = Pinecone(api_key=settings.pinecone_api_key)
+    index = pc.Index(settings.pinecone_index_name)
 
     return PineconeVectorStore(
         index=index,
-        embedding=embeddings,
+        embedding=get_document_embeddings(),
     )
 
+
+@lru_cache(maxsize=1)
+def get_bm25_index() -> BM25Index | None:
+    """Load the local BM25 index, or `None` when hybrid retrieval is disabled."""
+    settings = get_settings()
+    if not settings.hybrid_retrieval_enabled:
+        return None
+    return BM25Index(Path(settings.bm25_index_path))
+
+
 def get_retriever(k: int | None = None):
     """Get a Pinecone retriever instance.
 
@@ -48,6 +158,95 @@ def get_retriever(k: int | None = None):
     return vector_store.as_retriever(search_kwargs={"k": k})
 
 
+def _with_scores(results: List[Tuple[Document, float]]) -> List[Document]:
+    """Attach similarity scores to documents as `metadata["score"]`."""
+    for doc, score in results:
+        doc.metadata["score"] = float(score)
+    return [doc for doc, _ in results]
+
+
+def _search_by_vector(
+    vector_store: VectorStore, vector: List[float], k: int
+) -> List[Document]:
+    return _with_scores(vector_store.similarity_search_by_vector_with_score(vector, k=k))
+
+
+def _search_lexical(index: BM25Index, query: str, k: int) -> List[Document]:
+    with timer(VECTOR_LATENCY, operation="bm25_search"):
+        results = index.search(query, k=k)
+    for doc, score in results:
+        doc.metadata["bm25_score"] = float(score)
+    return [doc for doc, _ in results]
+
+
+def _fuse(
+    vector_docs: List[Document], lexical_docs: List[Document], k: int
+) -> List[Document]:
+    """Merge two rankings with reciprocal rank fusion.
+
+    Documents are matched by content hash (vector and lexical hits for the
+    same chunk may carry different ids). The fused score replaces
+    `metadata["score"]`; the original similarity is kept as
+    `metadata["vector_score"]`.
+    """
+    if not lexical_docs:
+        return vector_docs[:k]
+
+    rrf_k = get_settings().rrf_k
+    docs: Dict[str, Document] = {}
+    fused: Dict[str, float] = {}
+    for ranking in (vector_docs, lexical_docs):
+        for rank, doc in enumerate(ranking):
+            key = xxhash.xxh3_64_hexdigest(doc.page_content.strip().encode())
+            if key in docs:
+                docs[key].metadata.update(
+                    {name: value for name, value in doc.metadata.items() if name != "score"}
+                )
+            else:
+                docs[key] = doc
+                if "score" in doc.metadata:
+                    doc.metadata["vector_score"] = doc.metadata["score"]
+            fused[key] = fused.get(key, 0.0) + 1.0 / (rrf_k + rank + 1)
+
+    top = sorted(fused, key=fused.get, reverse=True)[:k]
+    for key in top:
+        docs[key].metadata["score"] = fused[key]
+    return [docs[key] for key in top]
+
+
+def _search_hybrid(
+    pool: ThreadPoolExecutor,
+    vector_store: VectorStore,
+    index: BM25Index | None,
+    query: str,
+    vector: List[float],
+    k: int,
+) -> List[Document]:
+    """Vector search, fused with a BM25 search run alongside it in `pool`."""
+    if index is None:
+        return _search_by_vector(vector_store, vector, k)
+    lexical = pool.submit(_search_lexical, index, query, k)
+    vector_docs = _search_by_vector(vector_store, vector, k)
+    return _fuse(vector_docs, lexical.result(), k)
+
+
+async def _asearch_hybrid(
+    vector_store: VectorStore,
+    index: BM25Index | None,
+    query: str,
+    vector: List[float],
+    k: int,
+) -> List[Document]:
+    """Async `_search_hybrid`: both searches run concurrently in threads."""
+    if index is None:
+        return await asyncio.to_thread(_search_by_vector, vector_store, vector, k)
+    vector_docs, lexical_docs = await asyncio.gather(
+        asyncio.to_thread(_search_by_vector, vector_store, vector, k),
+        asyncio.to_thread(_search_lexical, index, query, k),
+    )
+    return _fuse(vector_docs, lexical_docs, k)
+
+
 def retrieve(query: str, k: int | None = None) -> List[Document]:
     """Retrieve documents from Pinecone for a given query.
 
@@ -56,24 +255,171 @@ def retrieve(query: str, k: int | None = None) -> List[Document]:
         k: Number of documents to retrieve (defaults to config value).
 
     Returns:
-        List of Document objects with metadata (including page numbers).
+        List of Document objects with metadata (including page numbers and
+        the similarity `score`).
+    """
+    if k is None:
+        k = get_settings().retrieval_k
+
+    vector_store = _get_vector_store()
+    index = get_bm25_index()
+    with timer(VECTOR_LATENCY, operation="retrieve"):
+        if index is None:
+            return _with_scores(vector_store.similarity_search_with_score(query, k=k))
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            lexical = pool.submit(_search_lexical, index, query, k)
+            vector_docs = _with_scores(vector_store.similarity_search_with_score(query, k=k))
+            return _fuse(vector_docs, lexical.result(), k)
+
+
+def _known_vectors(
+    queries: Sequence[str], vectors: Sequence[List[float] | None] | None
+) -> Tuple[List[List[float] | None], List[int]]:
+    """Align precomputed vectors with `queries`; return them and the gaps."""
+    known = list(vectors) if vectors is not None else [None] * len(queries)
+    if len(known) != len(queries):
+        raise ValueError("`vectors` must have one entry per query.")
+    return known, [i for i, vector in enumerate(known) if vector is None]
+
+
+def retrieve_many(
+    queries: Sequence[str],
+    k: int | None = None,
+    vectors: Sequence[List[float] | None] | None = None,
+) -> List[List[Document]]:
+    """Retrieve documents for several queries with one embedding request.
+
+    All queries without a precomputed vector are embedded in a single
+    `embed_documents` batch, then the vector searches are issued
+    concurrently.
+
+    Args:
+        queries: Search query strings.
+        k: Number of documents to retrieve per query (defaults to config value).
+        vectors: Optional precomputed query vectors, aligned with `queries`
+            (`None` entries are embedded).
+
+    Returns:
+        One list of Document objects per query, in the same order as
+        `queries`, each carrying its similarity `score` in metadata.
+    """
+    if not queries:
+        return []
+    if k is None:
+        k = get_settings().retrieval_k
+
+    vector_store = _get_vector_store()
+    vectors, missing = _known_vectors(queries, vectors)
+    if missing:
+        with timer(VECTOR_LATENCY, operation="embed_queries"):
+            embedded = get_embeddings().embed_documents([queries[i] for i in missing])
+        for i, vector in zip(missing, embedded):
+            vectors[i] = vector
+
+    index = get_bm25_index()
+    # Each query's BM25 search takes a second worker while its vector
+    # search runs.
+    workers = len(vectors) * (1 if index is None else 2)
+    with timer(VECTOR_LATENCY, operation="search_many"), ThreadPoolExecutor(
+        max_workers=workers
+    ) as pool:
+        searches = [
+            pool.submit(_search_hybrid, pool, vector_store, index, query, vector, k)
+            for query, vector in zip(queries, vectors)
+        ]
+        return [search.result() for search in searches]
+
+
+async def aretrieve_many(
+    queries: Sequence[str],
+    k: int | None = None,
+    vectors: Sequence[List[float] | None] | None = None,
+) -> List[List[Document]]:
+    """Asynchronous variant of `retrieve_many`.
+
+    Args:
+        queries: Search query strings.
+        k: Number of documents to retrieve per query (defaults to config value).
+        vectors: Optional precomputed query vectors, aligned with `queries`
+            (`None` entries are embedded).
+
+    Returns:
+        One list of Document objects per query, in the same order as `queries`.
     """
-    retriever = get_retriever(k=k)
-    return retriever.invoke(query)
+    if not queries:
+        return []
+    if k is None:
+        k = get_settings().retrieval_k
+
+    vector_store = _get_vector_store()
+    vectors, missing = _known_vectors(queries, vectors)
+    if missing:
+        with timer(VECTOR_LATENCY, operation="embed_queries"):
+            embedded = await get_embeddings().aembed_documents([queries[i] for i in missing])
+        for i, vector in zip(missing, embedded):
+            vectors[i] = vector
+
+    index = get_bm25_index()
+    with timer(VECTOR_LATENCY, operation="search_many"):
+        return list(
+            await asyncio.gather(
+                *(
+                    _asearch_hybrid(vector_store, index, query, vector, k)
+                    for query, vector in zip(queries, vectors)
+                )
+            )
+        )
 
-def index_documents(docs: List[Document]) -> int:
+
+def index_documents(
+    docs: List[Document],
+    on_progress: Callable[[int, int], None] | None = None,
+) -> int:
     """Index a list of Document objects into the Pinecone vector store.
 
+    Chunks are embedded and upserted in batches of
+    `Settings.indexing_batch_size` so that progress can be reported. Each
+    batch is also appended to the BM25 index under the same chunk ids when
+    hybrid retrieval is enabled. Chunk ids are content hashes, so
+    re-indexing a chunk (e.g. a re-uploaded or corrected PDF) upserts it
+    instead of adding a duplicate.
+
     Args:
         docs: Documents to embed and upsert into the vector index.
+        on_progress: Optional callback invoked as `(chunks_done, chunks_total)`
+            after the split and after every batch.
 
     Returns:
         The number of documents indexed.
     """
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
     text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    texts = text_splitter.split_documents(docs)
+    chunks = {
+        xxhash.xxh3_128_hexdigest(chunk.page_content.encode()): chunk
+        for chunk in text_splitter.split_documents(docs)
+    }
+    chunk_ids = list(chunks)
+    texts = list(chunks.values())
+    batch_size = get_settings().indexing_batch_size
+
+    if on_progress is not None:
+        on_progress(0, len(texts))
 
     vector_store = _get_vector_store()
-    vector_store.add_documents(texts)
+    index = get_bm25_index()
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start : start + batch_size]
+        ids = chunk_ids[start : start + batch_size]
+        with timer(VECTOR_LATENCY, operation="add_documents"):
+            vector_store.add_documents(batch, ids=ids)
+        if index is not None:
+            with timer(VECTOR_LATENCY, operation="bm25_add"):
+                index.add_documents(batch, ids=ids)
+        if on_progress is not None:
+            on_progress(start + len(batch), len(texts))
+
+    global _corpus_version
+    _corpus_version += 1
 
     return len(texts)
\ No newline at end of file
@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
 
 
 class QuestionRequest(BaseModel):
@@ -10,6 +10,12 @@ class QuestionRequest(BaseModel):
     """
 
     question: str
+    # "full": planning, retrieval agent, summarization and verification.
+    # "fast": direct retrieval plus one grounded-answer LLM call.
+    mode: Literal["full", "fast"] = "full"
+    # Latency budget for this request in seconds (defaults to
+    # QA_LATENCY_BUDGET_SECONDS); stages that would exceed it fall back.
+    latency_budget_seconds: Optional[float] = Field(default=None, gt=0)
 
 
 class QAResponse(BaseModel):
@@ -24,3 +30,46 @@ class QAResponse(BaseModel):
     context: str
     plan: Optional[str] = None
     sub_questions: Optional[list[str]] = None
+    # Planner's assessment of the question: "simple", "moderate" or "complex"
+    complexity: Optional[str] = None
+    # "planning" when the question went through the planning agent,
+    # "direct" when it was simple enough to skip it.
+    route: Optional[str] = None
+    # Context size after extractive compression relative to the retrieved
+    # chunks (1.0 when compression is disabled).
+    compression_ratio: Optional[float] = None
+    # Stages that fell back to meet the latency budget, e.g.
+    # "verification:timeout" (the unverified draft was returned).
+    degradations: list[str] = []
+
+
+class BatchQuestionRequest(BaseModel):
+    """Request body for the `/qa/batch` endpoint."""
+
+    questions: list[str]
+    mode: Literal["full", "fast"] = "full"
+
+
+class BatchQAItem(BaseModel):
+    """Outcome of one question of a batch (`answer` or `error` is set)."""
+
+    question: str
+    answer: Optional[QAResponse] = None
+    error: Optional[str] = None
+    # True when served from the answer cache.
+    cached: bool = False
+
+
+class BatchQAResponse(BaseModel):
+    """Response body for the `/qa/batch` endpoint.
+
+    `results` follow the order of the submitted questions; duplicates are
+    answered once and repeated in every slot.
+    """
+
+    results: list[BatchQAItem]
+    questions: int
+    unique_questions: int
+    cache_hits: int
+    failed: int
+    total_seconds: float
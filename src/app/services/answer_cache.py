@@ -0,0 +1,263 @@
+"""In-memory answer cache for the QA service.
+
+Lookups first try an exact match on the normalized question text and then
+fall back to a cosine-similarity search over the embeddings of previously
+answered questions. Entries are evicted in LRU order once either the entry
+count or the approximate byte budget is exceeded, expire after a TTL, and
+are dropped wholesale whenever the indexed corpus changes.
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..core.config import get_settings
+from ..core.metrics import REGISTRY
+from ..core.retrieval.vector_store import get_corpus_version
+
+# Fields of the QA flow result that are stored and returned on a hit.
+CACHED_FIELDS = (
+    "answer",
+    "draft_answer",
+    "context",
+    "plan",
+    "sub_questions",
+    "complexity",
+    "route",
+    "compression_ratio",
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question for exact-match lookups.
+
+    Lower-cases, collapses whitespace and strips trailing punctuation so
+    that "What is HNSW?" and "what is  hnsw" share a cache key.
+    """
+    return _WHITESPACE_RE.sub(" ", question.lower()).strip().rstrip("?!. ")
+
+
+@dataclass
+class _Entry:
+    namespace: str
+    result: Dict[str, Any]
+    vector: Optional[np.ndarray]
+    expires_at: float
+    size: int
+
+
+def _estimate_size(result: Dict[str, Any], vector: Optional[np.ndarray]) -> int:
+    size = sys.getsizeof(result)
+    for value in result.values():
+        if isinstance(value, list):
+            size += sum(sys.getsizeof(item) for item in value)
+        size += sys.getsizeof(value)
+    if vector is not None:
+        size += vector.nbytes
+    return size
+
+
+class AnswerCache:
+    """Thread-safe LRU + TTL cache of QA results with semantic lookup."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        similarity_threshold: float,
+        version_fn: Callable[[], int] = lambda: 0,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._version_fn = version_fn
+        self._version = version_fn()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def corpus_version(self) -> int:
+        """Current corpus version; pass it to `put` for a run started now."""
+        return self._version_fn()
+
+    def _check_version(self) -> None:
+        version = self._version_fn()
+        if version != self._version:
+            self._version = version
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _purge_expired(self, now: float) -> None:
+        expired = [k for k, e in self._entries.items() if e.expires_at <= now]
+        for key in expired:
+            self._remove(key)
+
+    def get_exact(self, question: str, namespace: str = "") -> Optional[Dict[str, Any]]:
+        """Return the cached result for an exactly matching question.
+
+        Entries are partitioned by `namespace` (e.g. the pipeline mode) so
+        answers produced by different pipelines are never mixed.
+        """
+        key = f"{namespace}:{normalize_question(question)}"
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                return None
+            self._entries.move_to_end(key)
+            self.exact_hits += 1
+            return dict(entry.result)
+
+    def get_similar(
+        self, vector: Sequence[float], namespace: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached result of the most similar question, if any.
+
+        Only entries in the same `namespace` are considered. Counts a miss
+        when no entry reaches the similarity threshold.
+        """
+        query = _normalize_vector(vector)
+        with self._lock:
+            self._check_version()
+            self._purge_expired(time.monotonic())
+            keys: List[str] = []
+            vectors: List[np.ndarray] = []
+            for key, entry in self._entries.items():
+                if entry.vector is not None and entry.namespace == namespace:
+                    keys.append(key)
+                    vectors.append(entry.vector)
+            if vectors:
+                scores = np.stack(vectors) @ query
+                best = int(np.argmax(scores))
+                if scores[best] >= self.similarity_threshold:
+                    key = keys[best]
+                    self._entries.move_to_end(key)
+                    self.semantic_hits += 1
+                    return dict(self._entries[key].result)
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        question: str,
+        result: Dict[str, Any],
+        vector: Optional[Sequence[float]] = None,
+        namespace: str = "",
+        corpus_version: Optional[int] = None,
+    ) -> None:
+        """Store the result of a QA run, evicting LRU entries as needed.
+
+        Results produced with a degraded pipeline (a stage fell back to meet
+        its deadline) are not stored, nor are results whose run started
+        against an older corpus: pass the `corpus_version()` read before the
+        run, since the corpus may be re-indexed while it is in flight.
+        """
+        if result.get("degradations"):
+            return
+        key = f"{namespace}:{normalize_question(question)}"
+        stored = {field: result.get(field) for field in CACHED_FIELDS}
+        normalized = _normalize_vector(vector) if vector is not None else None
+        size = _estimate_size(stored, normalized)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._check_version()
+            if corpus_version is not None and corpus_version != self._version:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(
+                namespace=namespace,
+                result=stored,
+                vector=normalized,
+                expires_at=time.monotonic() + self.ttl_seconds,
+                size=size,
+            )
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            hits = self.exact_hits + self.semantic_hits
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def _normalize_vector(vector: Sequence[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    return array / norm if norm else array
+
+
+@lru_cache(maxsize=1)
+def get_answer_cache() -> AnswerCache:
+    """Get the process-wide answer cache configured from settings."""
+    settings = get_settings()
+    cache = AnswerCache(
+        max_entries=settings.answer_cache_max_entries,
+        max_bytes=settings.answer_cache_max_bytes,
+        ttl_seconds=settings.answer_cache_ttl_seconds,
+        similarity_threshold=settings.answer_cache_similarity_threshold,
+        version_fn=get_corpus_version,
+    )
+    REGISTRY.register_collector(
+        "ikms_answer_cache_lookups_total",
+        "Answer cache lookups by result.",
+        "counter",
+        lambda: [
+            ("ikms_answer_cache_lookups_total", {"result": "exact_hit"}, cache.exact_hits),
+            ("ikms_answer_cache_lookups_total", {"result": "semantic_hit"}, cache.semantic_hits),
+            ("ikms_answer_cache_lookups_total", {"result": "miss"}, cache.misses),
+        ],
+    )
+    REGISTRY.register_collector(
+        "ikms_answer_cache_entries",
+        "Entries currently held in the answer cache.",
+        "gauge",
+        lambda: [("ikms_answer_cache_entries", {}, cache.stats()["entries"])],
+    )
+    return cache
@@ -0,0 +1,189 @@
+"""Background job subsystem for PDF indexing.
+
+`/index-pdf` hands uploaded files to an `IndexingJobManager`, which runs
+`index_pdf_file` on a bounded thread pool and records per-job progress
+(stage, pages parsed, chunks indexed, throughput) for status polling via
+`/index-jobs/{job_id}`. Uploads are deduplicated by content hash so the
+same PDF is never indexed twice.
+"""
+
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.config import get_settings
+from .indexing_service import index_pdf_file
+
+
+def _marker_path(file_path: Path) -> Path:
+    """Marker file recording that an upload was indexed successfully."""
+    return file_path.with_suffix(".indexed")
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when too many indexing jobs are already waiting for a worker.
+
+    Carries a Retry-After hint in seconds, like `AdmissionRejected`.
+    """
+
+    def __init__(self, max_queued: int, retry_after: int) -> None:
+        super().__init__(f"{max_queued} indexing jobs are already queued.")
+        self.retry_after = retry_after
+
+
+@dataclass
+class IndexingJob:
+    """Status record for one indexing job."""
+
+    job_id: str
+    filename: str
+    stage: str = "queued"
+    pages_parsed: int = 0
+    chunks_total: int = 0
+    chunks_indexed: int = 0
+    embeddings_from_cache: int = 0
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.stage in ("completed", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        data["elapsed_seconds"] = round(elapsed, 3)
+        data["pages_per_second"] = round(self.pages_parsed / elapsed, 2) if elapsed else 0.0
+        data["chunks_per_second"] = round(self.chunks_indexed / elapsed, 2) if elapsed else 0.0
+        return data
+
+
+class IndexingJobManager:
+    """Runs indexing jobs on a bounded worker pool and tracks their progress."""
+
+    def __init__(self, max_workers: int, max_queued: int, history: int) -> None:
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.history = history
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="indexing"
+        )
+        self._jobs: "OrderedDict[str, IndexingJob]" = OrderedDict()
+        self._by_hash: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.stage == "queued")
+
+    def _retry_after(self) -> int:
+        """Seconds until a queue slot is likely free, from recent job durations.
+
+        A slot frees up when a worker finishes its job and takes the next
+        queued one.
+        """
+        durations = [
+            job.finished_at - job.started_at
+            for job in self._jobs.values()
+            if job.started_at is not None and job.finished_at is not None
+        ]
+        average = sum(durations) / len(durations) if durations else 1.0
+        return max(1, math.ceil(average / self.max_workers))
+
+    def submit(
+        self, file_path: Path, filename: str, content_hash: Optional[str] = None
+    ) -> Tuple[IndexingJob, bool]:
+        """Queue a PDF for indexing unless identical content is already indexed.
+
+        When `content_hash` matches a job that is queued, running or
+        completed (or a file indexed by an earlier process, recorded by an
+        `.indexed` marker next to the upload) that job is returned instead.
+
+        Returns:
+            Tuple of the job record and whether a new job was created.
+
+        Raises:
+            JobQueueFullError: If `max_queued` jobs are already waiting.
+        """
+        with self._lock:
+            if content_hash is not None:
+                existing = self._jobs.get(self._by_hash.get(content_hash, ""))
+                if existing is not None and existing.stage != "failed":
+                    return existing, False
+                if _marker_path(file_path).exists():
+                    job = IndexingJob(
+                        job_id=uuid.uuid4().hex, filename=filename, stage="completed"
+                    )
+                    self._register(job, content_hash)
+                    return job, False
+
+            if self._pending() >= self.max_queued:
+                raise JobQueueFullError(self.max_queued, self._retry_after())
+            job = IndexingJob(job_id=uuid.uuid4().hex, filename=filename)
+            self._register(job, content_hash)
+
+        self._executor.submit(self._run, job, file_path)
+        return job, True
+
+    def _register(self, job: IndexingJob, content_hash: Optional[str]) -> None:
+        self._jobs[job.job_id] = job
+        if content_hash is not None:
+            self._by_hash[content_hash] = job.job_id
+        self._trim_history()
+
+    def get(self, job_id: str) -> Optional[IndexingJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _trim_history(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+        live = set(self._jobs)
+        self._by_hash = {h: j for h, j in self._by_hash.items() if j in live}
+
+    def _run(self, job: IndexingJob, file_path: Path) -> None:
+        job.started_at = time.time()
+        job.stage = "parsing"
+
+        def on_progress(stage: str, done: int, total: int) -> None:
+            job.stage = stage
+            if stage == "parsing":
+                job.pages_parsed = done
+            else:
+                job.chunks_indexed = done
+                job.chunks_total = total
+
+        try:
+            result = index_pdf_file(file_path, on_progress=on_progress)
+        except Exception as exc:  # surfaced to the client via job status
+            job.error = f"{type(exc).__name__}: {exc}"
+            job.stage = "failed"
+        else:
+            job.embeddings_from_cache = result["embeddings_from_cache"]
+            job.stage = "completed"
+            _marker_path(file_path).touch()
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._trim_history()
+
+
+@lru_cache(maxsize=1)
+def get_indexing_job_manager() -> IndexingJobManager:
+    """Get the process-wide indexing job manager configured from settings."""
+    settings = get_settings()
+    return IndexingJobManager(
+        max_workers=settings.indexing_max_workers,
+        max_queued=settings.indexing_max_queued_jobs,
+        history=settings.indexing_job_history,
+    )
@@ -1,23 +1,50 @@
 """Service functions for indexing documents into the vector database."""
 
 from pathlib import Path
+from typing import Callable, Dict
 
-from langchain_community.document_loaders import PyPDFLoader
-
+from ..core.retrieval.embedding_cache import track_embedding_cache
+from ..core.retrieval.loaders import load_pdf
 from ..core.retrieval.vector_store import index_documents
 
 
-def index_pdf_file(file_path: Path) -> int:
+def index_pdf_file(
+    file_path: Path,
+    on_progress: Callable[[str, int, int], None] | None = None,
+) -> Dict[str, int]:
     """Load a PDF from disk and index it into the vector DB.
 
+    Pages are extracted with the backend selected by
+    `Settings.pdf_loader_backend` (see `core.retrieval.loaders`).
+
     Args:
         file_path: Path to the PDF file on disk.
+        on_progress: Optional callback invoked as `(stage, done, total)`;
+            `stage` is "parsing" (pages, total unknown so 0) or "indexing"
+            (chunks embedded and upserted).
 
     Returns:
-        Number of document chunks indexed.
+        Dictionary with the number of pages parsed, document chunks indexed
+        and how many chunk embeddings were served from the embedding cache
+        vs. computed.
     """
-    loader = PyPDFLoader(str(file_path))
-    docs = loader.load()
+    def report_pages(done: int) -> None:
+        if on_progress is not None:
+            on_progress("parsing", done, 0)
+
+    docs = load_pdf(file_path, on_page=report_pages)
+
+    def report_chunks(done: int, total: int) -> None:
+        if on_progress is not None:
+            on_progress("indexing", done, total)
 
     # Pass the loaded documents to the indexing function
-    return index_documents(docs)
+    with track_embedding_cache() as cache_stats:
+        chunks_indexed = index_documents(docs, on_progress=report_chunks)
+
+    return {
+        "pages_parsed": len(docs),
+        "chunks_indexed": chunks_indexed,
+        "embeddings_from_cache": cache_stats.hits,
+        "embeddings_computed": cache_stats.misses,
+    }
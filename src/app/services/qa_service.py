@@ -3,20 +3,242 @@
 This module provides a simple interface for the FastAPI layer to interact
 with the multi-agent RAG pipeline without depending directly on LangGraph
 or agent implementation details.
+
+Answers are served from the answer cache (see `answer_cache`) when the same
+or a semantically equivalent question was answered recently against the
+current corpus.
 """
 
-from typing import Dict, Any
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Sequence, Tuple
+
+from ..core.agents.graph import (
+    arun_qa_batch,
+    arun_qa_flow,
+    astream_qa_flow,
+    reuses_question_vector,
+    run_qa_flow,
+)
+from ..core.config import get_settings
+from ..core.retrieval.vector_store import get_embeddings
+from .answer_cache import get_answer_cache, normalize_question
 
-from ..core.agents.graph import run_qa_flow
+logger = logging.getLogger(__name__)
 
 
-def answer_question(question: str) -> Dict[str, Any]:
+def answer_question(
+    question: str, mode: str = "full", latency_budget: float | None = None
+) -> Dict[str, Any]:
     """Run the multi-agent QA flow for a given question.
 
+    Blocking variant for scripts; must not be called from inside a running
+    event loop.
+
     Args:
         question: User's natural language question about the vector databases paper.
+        mode: Pipeline profile, "full" or "fast".
+        latency_budget: Request deadline in seconds (defaults to
+            `Settings.qa_latency_budget_seconds`).
 
     Returns:
         Dictionary containing at least `answer` and `context` keys.
     """
-    return run_qa_flow(question)
+    if not get_settings().answer_cache_enabled:
+        return run_qa_flow(question, mode=mode, latency_budget=latency_budget)
+
+    cache = get_answer_cache()
+    version = cache.corpus_version()
+    cached = cache.get_exact(question, namespace=mode)
+    if cached is not None:
+        return cached
+
+    vector = get_embeddings().embed_query(question)
+    cached = cache.get_similar(vector, namespace=mode)
+    if cached is not None:
+        return cached
+
+    result = run_qa_flow(
+        question, mode=mode, latency_budget=latency_budget, question_vector=vector
+    )
+    cache.put(question, result, vector, namespace=mode, corpus_version=version)
+    return result
+
+
+async def aanswer_question(
+    question: str, mode: str = "full", latency_budget: float | None = None
+) -> Dict[str, Any]:
+    """Run the multi-agent QA flow for a given question without blocking.
+
+    Used by the API layer so that a single worker can serve many questions
+    concurrently while each one waits on LLM and vector store round trips.
+
+    Args:
+        question: User's natural language question about the vector databases paper.
+        mode: Pipeline profile, "full" or "fast".
+        latency_budget: Request deadline in seconds (defaults to
+            `Settings.qa_latency_budget_seconds`).
+
+    Returns:
+        Dictionary containing at least `answer` and `context` keys.
+    """
+    if not get_settings().answer_cache_enabled:
+        return await arun_qa_flow(question, mode=mode, latency_budget=latency_budget)
+
+    cache = get_answer_cache()
+    version = cache.corpus_version()
+    cached = cache.get_exact(question, namespace=mode)
+    if cached is not None:
+        return cached
+
+    vector = await get_embeddings().aembed_query(question)
+    cached = cache.get_similar(vector, namespace=mode)
+    if cached is not None:
+        return cached
+
+    result = await arun_qa_flow(
+        question, mode=mode, latency_budget=latency_budget, question_vector=vector
+    )
+    cache.put(question, result, vector, namespace=mode, corpus_version=version)
+    return result
+
+
+async def astream_answer(
+    question: str, mode: str = "full", latency_budget: float | None = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Answer a question while streaming per-stage progress events.
+
+    Yields the events documented on `astream_qa_flow`. Cache hits are
+    replayed as a `plan`, `context`, single `token` and `answer` event so
+    clients handle both paths identically.
+
+    Args:
+        question: User's natural language question about the vector databases paper.
+        mode: Pipeline profile, "full" or "fast".
+        latency_budget: Request deadline in seconds (see `aanswer_question`).
+
+    Yields:
+        Tuples of event name and JSON-serializable payload.
+    """
+    cache = get_answer_cache() if get_settings().answer_cache_enabled else None
+    vector = None
+    version = None
+    cached = None
+    if cache is not None:
+        version = cache.corpus_version()
+        cached = cache.get_exact(question, namespace=mode)
+        if cached is None:
+            vector = await get_embeddings().aembed_query(question)
+            cached = cache.get_similar(vector, namespace=mode)
+
+    if cached is not None:
+        yield "plan", {"plan": cached.get("plan"), "sub_questions": cached.get("sub_questions")}
+        yield "context", {"context": cached.get("context")}
+        yield "token", {"text": cached.get("answer") or ""}
+        yield "answer", cached
+        return
+
+    async for event, data in astream_qa_flow(
+        question, mode=mode, latency_budget=latency_budget, question_vector=vector
+    ):
+        if event == "answer" and cache is not None:
+            cache.put(question, data, vector, namespace=mode, corpus_version=version)
+        yield event, data
+
+
+async def aanswer_questions(
+    questions: Sequence[str], mode: str = "full"
+) -> Dict[str, Any]:
+    """Answer a batch of questions, sharing work between them.
+
+    Identical questions (after `normalize_question`) are answered once.
+    Every remaining question is embedded in a single `aembed_documents`
+    request; the vectors serve the answer-cache lookups and are handed to
+    the graph, so direct retrieval does not embed the questions again (see
+    `reuses_question_vector`). Cache misses run through `arun_qa_batch`
+    with bounded concurrency. A failing question is reported in its own
+    slot without failing the batch.
+
+    Args:
+        questions: User questions, possibly with duplicates.
+        mode: Pipeline profile, "full" or "fast".
+
+    Returns:
+        Dictionary with `results` (one entry per input question, in order,
+        holding `question`, `result`, `error` and `cached`) and aggregate
+        `questions`, `unique_questions`, `cache_hits`, `failed` and
+        `total_seconds`.
+    """
+    started = time.perf_counter()
+    unique: Dict[str, str] = {}
+    for question in questions:
+        unique.setdefault(normalize_question(question), question)
+
+    answers: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    cached_keys: set[str] = set()
+    vectors: Dict[str, List[float]] = {}
+    pending = list(unique)
+
+    cache = get_answer_cache() if get_settings().answer_cache_enabled else None
+    version = cache.corpus_version() if cache is not None else None
+    if cache is not None:
+        for key in pending:
+            cached = cache.get_exact(unique[key], namespace=mode)
+            if cached is not None:
+                answers[key] = cached
+        pending = [key for key in pending if key not in answers]
+
+    if pending and (cache is not None or reuses_question_vector(mode)):
+        embedded = await get_embeddings().aembed_documents([unique[key] for key in pending])
+        vectors = dict(zip(pending, embedded))
+
+    if cache is not None:
+        for key in pending:
+            cached = cache.get_similar(vectors[key], namespace=mode)
+            if cached is not None:
+                answers[key] = cached
+        pending = [key for key in pending if key not in answers]
+        cached_keys = set(answers)
+
+    outcomes = await arun_qa_batch(
+        [unique[key] for key in pending],
+        mode=mode,
+        question_vectors=[vectors.get(key) for key in pending],
+    )
+    for key, outcome in zip(pending, outcomes):
+        if isinstance(outcome, Exception):
+            logger.warning("Batch question %r failed: %s", unique[key], outcome)
+            errors[key] = str(outcome) or type(outcome).__name__
+            continue
+        answers[key] = outcome
+        if cache is not None:
+            cache.put(
+                unique[key], outcome, vectors.get(key), namespace=mode, corpus_version=version
+            )
+
+    results = []
+    for question in questions:
+        key = normalize_question(question)
+        results.append(
+            {
+                "question": question,
+                "result": answers.get(key),
+                "error": errors.get(key),
+                "cached": key in cached_keys,
+            }
+        )
+
+    return {
+        "results": results,
+        "questions": len(questions),
+        "unique_questions": len(unique),
+        "cache_hits": len(cached_keys),
+        "failed": len(errors),
+        "total_seconds": time.perf_counter() - started,
+    }
+
+
+def answer_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters and occupancy of the answer cache."""
+    return get_answer_cache().stats()
@@ -0,0 +1,86 @@
+"""Service functions for persisting uploaded PDFs.
+
+Uploads are copied to disk in fixed-size chunks while their xxh3-128
+content hash is computed, so memory use per upload stays bounded. By the
+time `save_upload` runs, Starlette has already received and spooled the
+whole multipart body; oversized bodies are rejected earlier, while they
+arrive, by the API's `UploadSizeLimitMiddleware`. Files are stored under
+their content hash, which lets identical uploads be detected and skipped.
+"""
+
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import xxhash
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured maximum size."""
+
+
+@dataclass
+class StoredUpload:
+    """A PDF upload persisted to disk under its content hash."""
+
+    path: Path
+    content_hash: str
+    size: int
+    # True when a file with identical content had already been stored.
+    duplicate: bool
+
+
+async def save_upload(
+    file: UploadFile, upload_dir: Path, max_bytes: int, chunk_size: int
+) -> StoredUpload:
+    """Stream an uploaded file to `upload_dir`, hashing it on the fly.
+
+    Args:
+        file: The incoming upload.
+        upload_dir: Directory in which uploads are stored.
+        max_bytes: Maximum accepted size of the file; larger uploads are
+            rejected (and the partial copy removed) once the limit is crossed.
+        chunk_size: Number of bytes read and written per step.
+
+    Returns:
+        The stored upload, named `<content hash>.pdf`.
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds `max_bytes`.
+    """
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    partial_path = upload_dir / f".{uuid.uuid4().hex}.part"
+    hasher = xxhash.xxh3_128()
+    size = 0
+
+    try:
+        with partial_path.open("wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"Upload exceeds the maximum size of {max_bytes} bytes."
+                    )
+                hasher.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+
+        content_hash = hasher.hexdigest()
+        final_path = upload_dir / f"{content_hash}.pdf"
+        duplicate = final_path.exists()
+        if duplicate:
+            partial_path.unlink()
+        else:
+            os.replace(partial_path, final_path)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+
+    return StoredUpload(
+        path=final_path,
+        content_hash=content_hash,
+        size=size,
+        duplicate=duplicate,
+    )
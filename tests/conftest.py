@@ -0,0 +1,71 @@
+"""Shared fixtures: the pipeline runs offline against a temporary corpus.
+
+The environment is set before any application module is imported, so the
+settings singleton picks up the fake LLM provider and the local vector
+store, with every on-disk artefact under a throwaway directory.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import pytest
+
+_DATA_DIR = Path(tempfile.mkdtemp(prefix="ikms-tests-"))
+
+os.environ.update(
+    {
+        "LLM_PROVIDER": "fake",
+        "VECTOR_STORE_BACKEND": "local",
+        "LOCAL_VECTOR_STORE_PATH": str(_DATA_DIR / "vector_store"),
+        "BM25_INDEX_PATH": str(_DATA_DIR / "bm25_index"),
+        "EMBEDDING_CACHE_PATH": str(_DATA_DIR / "embedding_cache.sqlite3"),
+        "UPLOAD_DIR": str(_DATA_DIR / "uploads"),
+        "ANSWER_CACHE_ENABLED": "false",
+        "PLAN_CACHE_ENABLED": "false",
+    }
+)
+
+from langchain_core.documents import Document  # noqa: E402
+
+from src.app.core import config  # noqa: E402
+from src.app.core.agents import graph  # noqa: E402
+from src.app.core.retrieval.vector_store import index_documents  # noqa: E402
+
+CORPUS = [
+    "HNSW indexing builds a layered proximity graph over the vectors. "
+    "Searches start at the top layer and greedily descend to the nearest neighbours.",
+    "IVF indexing partitions vectors into clusters around centroids. "
+    "Queries probe only the closest clusters, trading recall for speed.",
+    "Vector databases store embeddings and answer similarity queries. "
+    "They scale horizontally by sharding the index across nodes.",
+]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def corpus() -> None:
+    """Index a small corpus once per test session."""
+    index_documents(
+        [
+            Document(page_content=text, metadata={"page": page, "source": "paper.pdf"})
+            for page, text in enumerate(CORPUS, 1)
+        ]
+    )
+
+
+@pytest.fixture
+def settings() -> Iterator[Callable[..., Any]]:
+    """Override settings for one test; compiled graphs are rebuilt around it."""
+    original = config.get_settings()
+
+    def override(**values: Any) -> config.Settings:
+        config._settings = original.model_copy(update=values)
+        graph.get_qa_graph.cache_clear()
+        graph.get_fast_qa_graph.cache_clear()
+        return config._settings
+
+    yield override
+    config._settings = original
+    graph.get_qa_graph.cache_clear()
+    graph.get_fast_qa_graph.cache_clear()
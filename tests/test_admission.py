@@ -0,0 +1,50 @@
+"""Tests for admission control around the API endpoints."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.app.admission import get_admission_controller
+from src.app.api import app
+
+
+def _stream_until_disconnect() -> None:
+    """POST /qa/stream from a client that is gone before the response starts."""
+    body = json.dumps({"question": "How does HNSW indexing work?"}).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/qa/stream",
+        "raw_path": b"/qa/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            raise OSError("client disconnected")
+
+    asyncio.run(app(scope, receive, send))
+
+
+def test_slot_is_released_when_the_client_disconnects(settings):
+    settings()
+    controller = get_admission_controller("qa_stream")
+
+    with pytest.raises(OSError):
+        _stream_until_disconnect()
+
+    assert controller.in_flight == 0
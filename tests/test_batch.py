@@ -0,0 +1,43 @@
+"""Tests for batch QA (`aanswer_questions`)."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from src.app.core.retrieval.vector_store import get_embeddings
+from src.app.services.qa_service import aanswer_questions
+
+QUESTIONS = [
+    "What is HNSW indexing?",
+    "How does IVF indexing work?",
+    "How do vector databases scale?",
+    "what is hnsw indexing",
+]
+
+
+@pytest.fixture
+def embedding_calls(monkeypatch) -> List[List[str]]:
+    """Record the texts of every query embedding request."""
+    embeddings = get_embeddings()
+    calls: List[List[str]] = []
+    original = embeddings.aembed_documents
+
+    async def aembed_documents(texts):
+        calls.append(list(texts))
+        return await original(texts)
+
+    monkeypatch.setattr(embeddings, "aembed_documents", aembed_documents)
+    return calls
+
+
+@pytest.mark.parametrize("cache_enabled", [False, True])
+def test_fast_batch_embeds_questions_once(settings, embedding_calls, cache_enabled):
+    settings(answer_cache_enabled=cache_enabled)
+
+    batch = asyncio.run(aanswer_questions(QUESTIONS, mode="fast"))
+
+    assert batch["failed"] == 0
+    assert batch["unique_questions"] == 3
+    assert all(item["result"]["answer"] for item in batch["results"])
+    assert embedding_calls == [QUESTIONS[:3]]
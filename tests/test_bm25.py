@@ -0,0 +1,51 @@
+"""Tests for the segment-persisted `BM25Index`."""
+
+from langchain_core.documents import Document
+
+from src.app.core.retrieval import bm25
+from src.app.core.retrieval.bm25 import BM25Index
+
+
+def _ids(index: BM25Index, query: str) -> list:
+    return sorted(doc.id for doc, _ in index.search(query, k=10))
+
+
+def test_delete_survives_reopen(tmp_path):
+    index = BM25Index(tmp_path)
+    index.add_documents(
+        [Document(page_content="HNSW graph index"), Document(page_content="HNSW layers")],
+        ids=["A", "B"],
+    )
+
+    assert index.delete(["A", "missing"])
+    assert not index.delete(["missing"])
+
+    assert _ids(index, "HNSW") == ["B"]
+    assert _ids(BM25Index(tmp_path), "HNSW") == ["B"]
+    assert len(BM25Index(tmp_path)) == 1
+
+
+def test_upsert_replaces_the_earlier_version(tmp_path):
+    index = BM25Index(tmp_path)
+    index.add_documents([Document(page_content="IVF clusters")], ids=["A"])
+    index.add_documents([Document(page_content="HNSW graph")], ids=["A"])
+
+    reopened = BM25Index(tmp_path)
+
+    assert _ids(reopened, "IVF") == []
+    assert _ids(reopened, "HNSW") == ["A"]
+    assert len(reopened) == 1
+
+
+def test_merged_segments_keep_adds_and_deletes(tmp_path, monkeypatch):
+    monkeypatch.setattr(bm25, "_MAX_SEGMENTS", 3)
+    index = BM25Index(tmp_path)
+    for n in range(10):
+        index.add_documents([Document(page_content=f"HNSW note {n}")], ids=[str(n)])
+        if n % 3 == 0:
+            index.delete([str(n)])
+
+    reopened = BM25Index(tmp_path)
+
+    assert len(list(tmp_path.glob("segment-*.json.gz"))) <= 3
+    assert _ids(reopened, "HNSW") == _ids(index, "HNSW") == ["1", "2", "4", "5", "7", "8"]
@@ -0,0 +1,39 @@
+"""Tests for context deduplication across retrieval results."""
+
+from langchain_core.documents import Document
+
+from src.app.core.retrieval.compression import compress_documents
+from src.app.core.retrieval.context import assemble_context
+
+TEXT = "HNSW indexing builds a layered proximity graph over the vectors."
+
+
+def test_same_content_under_different_ids_is_kept_once():
+    results = [
+        [Document(id="a", page_content=TEXT, metadata={"page": 1})],
+        [Document(id="b", page_content=TEXT, metadata={"page": 1})],
+    ]
+
+    assert len(assemble_context(results, token_budget=10_000)) == 1
+
+
+def test_same_id_is_kept_once():
+    results = [
+        [Document(id="a", page_content=TEXT)],
+        [Document(id="a", page_content=TEXT + " ")],
+    ]
+
+    assert len(assemble_context(results, token_budget=10_000)) == 1
+
+
+def test_compression_keeps_duplicates_aligned_with_their_results():
+    results = [
+        [Document(id="a", page_content=TEXT)],
+        [Document(id="b", page_content=TEXT), Document(id="c", page_content="IVF probes clusters.")],
+    ]
+
+    compressed, _ = compress_documents(results, ["How does HNSW work?"])
+
+    assert [len(result) for result in compressed] == [1, 2]
+    assert compressed[0][0] is compressed[1][0]
+    assert len(assemble_context(compressed, token_budget=10_000)) == 2
@@ -0,0 +1,71 @@
+"""Tests for stage timeouts and their fallbacks."""
+
+import asyncio
+
+import pytest
+
+from src.app.core.agents import agents, deadline
+from src.app.core.agents.deadline import RETRIEVAL_TIMEOUT_ANSWER
+from src.app.core.agents.graph import arun_qa_flow
+
+QUESTION = "How does HNSW indexing work?"
+
+
+@pytest.mark.parametrize("mode", ["full", "fast"])
+def test_retrieval_timeout_is_not_reported_as_an_empty_corpus(settings, monkeypatch, mode):
+    settings(retrieval_mode="direct", retrieval_timeout_seconds=0.05)
+
+    async def slow_retrieve(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(agents, "aretrieve_many", slow_retrieve)
+
+    result = asyncio.run(arun_qa_flow(QUESTION, mode=mode))
+
+    assert "retrieval:timeout" in result["degradations"]
+    assert result["answer"] == RETRIEVAL_TIMEOUT_ANSWER
+
+
+def test_stage_timeouts_count_towards_the_p95(settings, monkeypatch):
+    settings(planning_timeout_seconds=0.05, hedge_min_samples=1)
+    monkeypatch.setattr(deadline, "STAGE_LATENCIES", deadline.StageLatencies())
+
+    @deadline.with_deadline("planning")
+    async def planning(state):
+        await asyncio.sleep(1)
+
+    update = asyncio.run(planning({}))
+
+    assert update["degradations"] == ["planning:timeout"]
+    assert deadline.STAGE_LATENCIES.p95("planning") >= 0.05
+
+
+def test_hedging_delay_comes_from_llm_calls_only(settings, monkeypatch):
+    settings(plan_cache_enabled=True, hedge_min_samples=1)
+    monkeypatch.setattr(deadline, "CALL_LATENCIES", deadline.StageLatencies())
+    question = "How does HNSW indexing compare to IVF indexing in vector databases?"
+
+    asyncio.run(arun_qa_flow(question))
+    first = deadline.CALL_LATENCIES.p95("planning")
+    for _ in range(5):
+        # Served from the plan cache: no call, no sample.
+        asyncio.run(arun_qa_flow(question))
+
+    assert first is not None
+    assert deadline.CALL_LATENCIES.p95("planning") == first
+
+
+def test_cancelled_calls_are_sampled(settings, monkeypatch):
+    settings(hedge_min_samples=1)
+    monkeypatch.setattr(deadline, "CALL_LATENCIES", deadline.StageLatencies())
+
+    async def slow_call():
+        await asyncio.sleep(1)
+
+    async def run():
+        await asyncio.wait_for(deadline.hedged("verification", {}, slow_call), 0.05)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+    assert deadline.CALL_LATENCIES.p95("verification") >= 0.05
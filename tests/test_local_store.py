@@ -0,0 +1,55 @@
+"""Tests for the memory-mapped `LocalVectorStore`."""
+
+from src.app.core.llm.fake import HashEmbeddings
+from src.app.core.retrieval import vector_store
+from src.app.core.retrieval.local_store import LocalVectorStore
+
+
+def test_upsert_survives_reopen(tmp_path):
+    embedding = HashEmbeddings(dimensions=64)
+    store = LocalVectorStore(embedding=embedding, path=tmp_path)
+    store.add_texts(["old text about graphs"], ids=["X"])
+    store.add_texts(["new text about graphs"], ids=["X"])
+
+    reopened = LocalVectorStore(embedding=embedding, path=tmp_path)
+
+    assert [doc.page_content for doc in reopened.get_by_ids(["X"])] == ["new text about graphs"]
+    assert [doc.page_content for doc in reopened.similarity_search("graphs", k=4)] == [
+        "new text about graphs"
+    ]
+
+
+def test_delete_survives_reopen(tmp_path):
+    embedding = HashEmbeddings(dimensions=64)
+    store = LocalVectorStore(embedding=embedding, path=tmp_path)
+    store.add_texts(["first", "second"], ids=["A", "B"])
+    store.delete(["A"])
+
+    reopened = LocalVectorStore(embedding=embedding, path=tmp_path)
+
+    assert reopened.get_by_ids(["A", "B"])[0].id == "B"
+    assert len(reopened.get_by_ids(["A", "B"])) == 1
+
+
+def test_delete_notifies_only_for_removed_ids(tmp_path):
+    deleted = []
+    store = LocalVectorStore(
+        embedding=HashEmbeddings(dimensions=64), path=tmp_path, on_delete=deleted.append
+    )
+    store.add_texts(["first", "second"], ids=["A", "B"])
+    store.add_texts(["first again"], ids=["A"])
+    store.delete(["A", "missing"])
+
+    assert deleted == [["A"]]
+
+
+def test_delete_bumps_the_corpus_version():
+    store = vector_store._get_vector_store()
+    store.add_texts(["A chunk that is about to be deleted."], ids=["doomed"])
+    version = vector_store.get_corpus_version()
+
+    store.delete(["missing"])
+    assert vector_store.get_corpus_version() == version
+
+    store.delete(["doomed"])
+    assert vector_store.get_corpus_version() > version
@@ -0,0 +1,34 @@
+"""Tests for the LLM metrics recorded per QA graph stage."""
+
+import asyncio
+
+from src.app.core.agents.graph import arun_qa_flow
+from src.app.core.metrics import LLM_LATENCY, LLM_TOKENS
+
+QUESTION = "How does HNSW indexing compare to IVF indexing in vector databases?"
+
+
+def _prompt_tokens(node: str) -> float:
+    return LLM_TOKENS.value(node=node, kind="prompt")
+
+
+def test_llm_metrics_are_labelled_by_stage(settings):
+    settings(grounding_check_enabled=False, retrieval_mode="agentic")
+    stages = ("planning", "retrieval", "summarization", "verification")
+    before = {stage: _prompt_tokens(stage) for stage in stages}
+
+    asyncio.run(arun_qa_flow(QUESTION))
+
+    for stage in stages:
+        assert _prompt_tokens(stage) > before[stage], stage
+    assert _prompt_tokens("model") == 0
+    assert 'node="summarization"' in "\n".join(LLM_LATENCY.render())
+
+
+def test_fast_profile_is_labelled_answer(settings):
+    settings()
+    before = _prompt_tokens("answer")
+
+    asyncio.run(arun_qa_flow(QUESTION, mode="fast"))
+
+    assert _prompt_tokens("answer") > before
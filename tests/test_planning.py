@@ -0,0 +1,12 @@
+"""Tests for the plan cache key."""
+
+from src.app.core.agents.planning import plan_key
+
+
+def test_plan_key_ignores_case_punctuation_and_whitespace():
+    assert plan_key("How does  HNSW work?") == plan_key("how does HNSW work")
+
+
+def test_plan_key_keeps_question_words():
+    assert plan_key("How does HNSW work?") != plan_key("Why does HNSW work?")
+    assert plan_key("What is IVF?") != plan_key("When is IVF?")
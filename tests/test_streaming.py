@@ -0,0 +1,76 @@
+"""Tests for the streamed QA flow (`astream_qa_flow`)."""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from src.app.core.agents.graph import astream_qa_flow
+from src.app.core.llm.fake import FakeChatModel
+
+QUESTION = "How does HNSW indexing compare to IVF indexing in vector databases?"
+
+
+def _collect(mode: str) -> List[Tuple[str, Dict[str, Any]]]:
+    async def run() -> List[Tuple[str, Dict[str, Any]]]:
+        return [event async for event in astream_qa_flow(QUESTION, mode=mode)]
+
+    return asyncio.run(run())
+
+
+def _tokens(events: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+    return [data["text"] for name, data in events if name == "token"]
+
+
+def test_verification_answer_is_streamed_token_by_token(settings):
+    settings(grounding_check_enabled=False)
+
+    events = _collect("full")
+    tokens = _tokens(events)
+    name, final_state = events[-1]
+
+    assert name == "answer"
+    assert final_state["verification_skipped"] is not True
+    assert len(tokens) > 1
+    assert "".join(tokens) == final_state["answer"]
+    assert [name for name, _ in events[:2]] == ["plan", "context"]
+
+
+def test_fast_answer_is_streamed_token_by_token(settings):
+    settings()
+
+    events = _collect("fast")
+    tokens = _tokens(events)
+    name, final_state = events[-1]
+
+    assert name == "answer"
+    assert len(tokens) > 1
+    assert "".join(tokens) == final_state["answer"]
+
+
+def test_grounded_draft_is_sent_as_one_token(settings):
+    settings(grounding_check_enabled=True, grounding_threshold=0.0)
+
+    events = _collect("full")
+    name, final_state = events[-1]
+
+    assert final_state["verification_skipped"] is True
+    assert _tokens(events) == [final_state["answer"]]
+
+
+def test_verification_timeout_replaces_the_streamed_tokens(settings, monkeypatch):
+    settings(grounding_check_enabled=False, verification_timeout_seconds=0.1)
+    astream = FakeChatModel._astream
+
+    async def slow_astream(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async for chunk in astream(self, *args, **kwargs):
+            await asyncio.sleep(0.02)
+            yield chunk
+
+    monkeypatch.setattr(FakeChatModel, "_astream", slow_astream)
+
+    events = _collect("full")
+    name, final_state = events[-1]
+    replaced = [data["text"] for name, data in events if name == "replace"]
+
+    assert final_state["degradations"] == ["verification:timeout"]
+    assert _tokens(events)
+    assert replaced == [final_state["answer"]]
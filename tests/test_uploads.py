@@ -0,0 +1,63 @@
+"""Tests for the `/index-pdf` upload size limit."""
+
+import asyncio
+from typing import AsyncIterator
+
+import httpx
+
+from src.app import api
+from src.app.api import app
+from src.app.services.indexing_jobs import IndexingJobManager
+
+BOUNDARY = "test-boundary"
+HEADERS = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+PART_HEADER = (
+    f"--{BOUNDARY}\r\n"
+    'Content-Disposition: form-data; name="file"; filename="paper.pdf"\r\n'
+    "Content-Type: application/pdf\r\n\r\n"
+).encode()
+
+
+def _post(content) -> httpx.Response:
+    async def run() -> httpx.Response:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/index-pdf", content=content, headers=HEADERS)
+
+    return asyncio.run(run())
+
+
+def test_declared_oversized_upload_is_rejected(settings):
+    settings(upload_max_bytes=1000)
+
+    response = _post(PART_HEADER + b"x" * 2000)
+
+    assert response.status_code == 413
+
+
+def test_chunked_oversized_upload_is_aborted_while_arriving(settings):
+    settings(upload_max_bytes=1000)
+    sent = [0]
+
+    async def body() -> AsyncIterator[bytes]:
+        yield PART_HEADER
+        for _ in range(100):
+            sent[0] += 100
+            yield b"x" * 100
+        yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+    response = _post(body())
+
+    assert response.status_code == 413
+    assert sent[0] <= 1000
+
+
+def test_full_job_queue_asks_clients_to_retry_later(settings, monkeypatch):
+    settings()
+    manager = IndexingJobManager(max_workers=1, max_queued=0, history=10)
+    monkeypatch.setattr(api, "get_indexing_job_manager", lambda: manager)
+
+    response = _post(PART_HEADER + b"%PDF-1.4 queue test" + f"\r\n--{BOUNDARY}--\r\n".encode())
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1